@@ -215,6 +215,8 @@ class DataHolder:
         self.data = \
             self._preprocess_data(raw_data, time_format, time_errors, dayfirst, yearfirst) if preprocess else raw_data
         self.grouped_data = None
+        # Preprocessed data is sorted by id, so the events of every trace go in a row
+        self._is_sorted_by_id = preprocess
 
     def _preprocess_data(self, df, time_format, time_errors, dayfirst, yearfirst):
         """
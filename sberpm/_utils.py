@@ -2,7 +2,12 @@
 #   Licence: BSD-3-Clause License
 #   Link: https://github.com/numpy/numpy
 
+# cuDF Python module is used in this file (optional).
+#   Licence: Apache-2.0 License
+#   Link: https://github.com/rapidsai/cudf
+
 import numpy as np
+import warnings
 
 
 def generate_data_partitions(df, id_column, batch_num):
@@ -25,3 +30,27 @@ def generate_data_partitions(df, id_column, batch_num):
             yield df.iloc[start_index: next_start_index]
         else:
             yield df.iloc[start_index:]
+
+
+def import_cudf(engine):
+    """
+    Returns the cudf module if the calculation must be done on GPU.
+
+    Parameters
+    ----------
+    engine: {'pandas', 'cudf'}
+        Name of the dataframe engine.
+
+    Returns
+    -------
+    cudf: module or None
+        The cudf module if engine is 'cudf' and cudf is installed, None otherwise.
+    """
+    if engine != 'cudf':
+        return None
+    try:
+        import cudf
+    except ImportError:
+        warnings.warn('cudf is not installed, the calculation will be done with pandas on CPU.', UserWarning)
+        return None
+    return cudf
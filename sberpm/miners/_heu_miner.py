@@ -1,13 +1,105 @@
+# Numpy Python module is used in this file.
+#   Licence: BSD-3-Clause License
+#   Link: https://github.com/numpy/numpy
+
 # Pandas Python module is used in this file.
 #   Licence: BSD-3-Clause License
 #   Link: https://github.com/pandas-dev/pandas
 
+# Numba Python module is used in this file (optional).
+#   Licence: BSD-2-Clause License
+#   Link: https://github.com/numba/numba
+
 from .._holder import DataHolder
+from .._utils import import_cudf
 from ._abstract_miner import AbstractMiner
 from ..visual._graph import create_dfg
 
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _count_pairs_loop(ids, codes, lag, n_acts):
+    """
+    Counts pairs of activities that are 'lag' events apart in the same event trace
+    in a single pass over the sorted log.
+
+    Parameters
+    ----------
+    ids: np.ndarray of int
+        Codes of the event traces, the events of one trace must go in a row.
+
+    codes: np.ndarray of int
+        Codes of the activities.
+
+    lag: int
+        Distance between the activities in a pair.
+
+    n_acts: int
+        Number of unique activities.
+
+    Returns
+    -------
+    counts: np.ndarray of int, shape=[n_acts * n_acts]
+        Number of pairs, the pair (a, b) is stored at index a * n_acts + b.
+    """
+    counts = np.zeros(n_acts * n_acts, dtype=np.int64)
+    for i in range(len(codes) - lag):
+        if ids[i] == ids[i + lag]:
+            counts[codes[i] * n_acts + codes[i + lag]] += 1
+    return counts
+
+
+def _count_pairs_numpy(ids, codes, lag, n_acts):
+    """
+    The same as _count_pairs_loop, but vectorized with numpy (used if numba is not installed).
+    """
+    same_id_mask = ids[:-lag] == ids[lag:]
+    keys = codes[:-lag][same_id_mask] * n_acts + codes[lag:][same_id_mask]
+    return np.bincount(keys, minlength=n_acts * n_acts)
+
+
+_count_pairs = njit(cache=True)(_count_pairs_loop) if njit is not None else _count_pairs_numpy
+
+
+def count_edges(ids, codes, lag, n_acts):
+    """
+    Counts the pairs of activities that are 'lag' events apart in the same event trace.
+
+    Parameters
+    ----------
+    ids: np.ndarray of int
+        Codes of the event traces, the events of one trace must go in a row.
+
+    codes: np.ndarray of int
+        Codes of the activities.
+
+    lag: int
+        Distance between the activities in a pair.
+
+    n_acts: int
+        Number of unique activities.
+
+    Returns
+    -------
+    a_idx: np.ndarray of int
+        Codes of the first activities in the pairs.
+
+    b_idx: np.ndarray of int
+        Codes of the second activities in the pairs.
+
+    counts: np.ndarray of int
+        Number of the pairs in the log.
+    """
+    counts = _count_pairs(ids, codes, lag, n_acts)
+    keys = np.nonzero(counts)[0]
+    return keys // n_acts, keys % n_acts, counts[keys]
+
 
 class HeuMiner(AbstractMiner):
     """
@@ -27,6 +119,10 @@ class HeuMiner(AbstractMiner):
         If it will be equal to or higher than the threshold, the edge will remain,
         otherwise it will be removed.
 
+    engine : {'pandas', 'cudf'}, default='pandas'
+        If 'cudf', the pairs of activities are counted on GPU using RAPIDS cuDF.
+        If cuDF is not installed, the calculation is done on CPU.
+
     Attributes
     ----------
     threshold: float
@@ -71,9 +167,12 @@ class HeuMiner(AbstractMiner):
     https://pdfs.semanticscholar.org/1cc3/d62e27365b8d7ed6ce93b41c193d0559d086.pdf
     """
 
-    def __init__(self, data_holder, threshold=0.8):
+    def __init__(self, data_holder, threshold=0.8, engine='pandas'):
         super().__init__(data_holder)
+        if engine not in ['pandas', 'cudf']:
+            raise ValueError(f'Only "pandas" and "cudf" engines are supported, but received: "{engine}"')
         self.threshold = threshold
+        self._engine = engine
         self.heu_df = None  # ['a', 'b', 'a_b', 'b_a', 'coeff']
 
     def apply(self):
@@ -89,21 +188,62 @@ class HeuMiner(AbstractMiner):
         self._create_edges(graph)
         self.graph = graph
 
-    def _calc_coeffs(self):
-        df = pd.DataFrame()
-        heu_df = pd.DataFrame()
-        heu_df_len_2 = pd.DataFrame()
+    def _count_pairs(self):
+        """
+        Counts the pairs of activities that follow each other directly (lag 1)
+        and through one activity (lag 2) in the same event trace.
+
+        Returns
+        -------
+        len_1: pd.DataFrame
+            Columns: 'a', 'b', 'a>b'.
+
+        len_2: pd.DataFrame
+            Columns: 'a', 'b', 'a>>b'.
+        """
+        cudf = import_cudf(self._engine)
+        if cudf is not None:
+            return self._count_pairs_gpu(cudf)
+
+        ids, _ = pd.factorize(self._data_holder.data[self._data_holder.id_column])
+        codes, activities = pd.factorize(self._data_holder.data[self._data_holder.activity_column], sort=True)
+        # The kernel needs the events of every trace to go in a row (DataHolder sorts the data by id)
+        if len(ids) > 1 and (ids[1:] < ids[:-1]).any():
+            order = np.argsort(ids, kind='stable')
+            ids, codes = ids[order], codes[order]
+        # Missing activities get an extra code, the pairs containing it are dropped
+        n_acts = len(activities)
+        codes = np.where(codes == -1, n_acts, codes)
+        activities = np.asarray(activities)
+
+        result = []
+        for lag, count_column in [(1, 'a>b'), (2, 'a>>b')]:
+            a_idx, b_idx, counts = count_edges(ids, codes, lag, n_acts + 1)
+            mask = (a_idx != n_acts) & (b_idx != n_acts)
+            result.append(pd.DataFrame({'a': activities[a_idx[mask]],
+                                        'b': activities[b_idx[mask]],
+                                        count_column: counts[mask]}))
+        return tuple(result)
 
-        df['id'] = self._data_holder.data[self._data_holder.id_column]
-        df['a'] = self._data_holder.data[self._data_holder.activity_column]
-        heu_df_len_1 = df.copy()
-        heu_df_len_2 = df.copy()
-        heu_df_len_1['b'] = df.groupby('id')['a'].shift(-1)
-        heu_df_len_2['b'] = df.groupby('id')['a'].shift(-2)
+    def _count_pairs_gpu(self, cudf):
+        """
+        The same as _count_pairs, but the grouping and counting are done on GPU.
+        """
+        df_gpu = cudf.from_pandas(self._data_holder.data[[self._data_holder.id_column,
+                                                          self._data_holder.activity_column]])
+        df_gpu.columns = ['id', 'a']
+        result = []
+        for lag, count_column in [(1, 'a>b'), (2, 'a>>b')]:
+            df_gpu['b'] = df_gpu.groupby('id')['a'].shift(-lag)
+            # Only the small table of pairs is moved back to CPU
+            pairs = df_gpu.groupby(['a', 'b']).size().reset_index(name=count_column).to_pandas()
+            result.append(pairs.sort_values(['a', 'b']).reset_index(drop=True))
+        return tuple(result)
+
+    def _calc_coeffs(self):
+        heu_df_len_1, heu_df_len_2 = self._count_pairs()
 
         # calculate coeff for 2 loop
-        heu_df_len_2 = heu_df_len_2.groupby(['a', 'b']).count().reset_index() \
-            .rename(columns={'id': 'a>>b'})[['a', 'b', 'a>>b']]
         heu_df_len_2['b<<a'] = 0
         temp_a_b = (heu_df_len_2['a'] + ' -> ' + heu_df_len_2['b'])
         temp_b_a = (heu_df_len_2['b'] + ' -> ' + heu_df_len_2['a'])
@@ -116,23 +256,21 @@ class HeuMiner(AbstractMiner):
                                 (heu_df_len_2['a>>b'] + heu_df_len_2['b<<a'] + 1)
 
         # calculate coeff
-        heu_df_len_1 = heu_df_len_1.groupby(['a', 'b']).count().reset_index() \
-            .rename(columns={'id': 'a>b'})[['a', 'b', 'a>b']]
         heu_df_len_1['b<a'] = 0
         temp_a_b = (heu_df_len_1['a'] + ' -> ' + heu_df_len_1['b'])
         temp_b_a = (heu_df_len_1['b'] + ' -> ' + heu_df_len_1['a'])
         indexes = temp_a_b[temp_a_b.isin(temp_b_a) & (heu_df_len_1['a'] != heu_df_len_1['b'])].index
 
-        # find self loop
-        indexes_self_loop = temp_a_b[heu_df_len_1['a'] == heu_df_len_1['b']].index
-
         for i in indexes:
             mask_b_a_row = (heu_df_len_1['a'] == heu_df_len_1['b'].iloc[i]) & \
                            (heu_df_len_1['b'] == heu_df_len_1['a'].iloc[i])
             heu_df_len_1.loc[i, 'b<a'] = int(heu_df_len_1[mask_b_a_row]['a>b'])
-        heu_df_len_1['coeff'] = (heu_df_len_1['a>b'] - heu_df_len_1['b<a']) / \
-                                (heu_df_len_1['a>b'] + heu_df_len_1['b<a'] + 1)
-        heu_df_len_1.loc[indexes_self_loop, 'coeff'] = heu_df_len_1['a>b'] / (heu_df_len_1['a>b'] + 1)
+
+        # self loops have their own formula
+        a_b = heu_df_len_1['a>b'].to_numpy()
+        b_a = heu_df_len_1['b<a'].to_numpy()
+        self_loop_mask = heu_df_len_1['a'].to_numpy() == heu_df_len_1['b'].to_numpy()
+        heu_df_len_1['coeff'] = np.where(self_loop_mask, a_b / (a_b + 1), (a_b - b_a) / (a_b + b_a + 1))
 
         heu_df_len_2['filter'] = heu_df_len_2.apply(
             lambda x: self._filter_func(x, list(zip(heu_df_len_1['a'], heu_df_len_1['b']))), axis=1)
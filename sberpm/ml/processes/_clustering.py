@@ -10,12 +10,21 @@
 #   Licence: BSD-3-Clause License
 #   Link: https://github.com/scikit-learn/scikit-learn
 
+# Joblib Python module is used in this file.
+#   Licence: BSD-3-Clause License
+#   Link: https://github.com/joblib/joblib
+
 
+from joblib import Parallel, delayed
 from sklearn.cluster import KMeans
 import pandas as pd
 import numpy as np
 
 
+def _fit_kmeans(embeddings, n_clusters, random_state):
+    return KMeans(n_clusters=n_clusters, random_state=random_state).fit(embeddings)
+
+
 class GraphClustering:
     """
     Class for clustering event traces.
@@ -58,7 +67,7 @@ class GraphClustering:
         self._method = method
         self._model = None
 
-    def fit(self, embeddings, min_cluster_num=2, max_cluster_num=4, random_state=42):
+    def fit(self, embeddings, min_cluster_num=2, max_cluster_num=4, random_state=42, n_jobs=-1):
         """
         Trains the model and searches for the optimal number of clusters.
 
@@ -75,6 +84,10 @@ class GraphClustering:
 
         random_state: int, default=42
 
+        n_jobs: int, default=-1
+            Number of processes used to fit the models with different numbers of clusters in parallel.
+            If -1, all CPUs are used.
+
         Returns
         -------
         self
@@ -82,9 +95,11 @@ class GraphClustering:
         models = {}
 
         if self._method == 'kmeans':
+            # The models are independent, so they are fitted in parallel
+            fitted = Parallel(n_jobs=n_jobs, backend='loky')(
+                delayed(_fit_kmeans)(embeddings, k, random_state) for k in range(min_cluster_num, max_cluster_num + 1))
             scores = []
-            for k in range(min_cluster_num, max_cluster_num + 1):
-                kmeans = KMeans(n_clusters=k, random_state=random_state).fit(embeddings)
+            for k, kmeans in zip(range(min_cluster_num, max_cluster_num + 1), fitted):
                 scores.append(kmeans.inertia_)
                 models[k - min_cluster_num] = kmeans
 
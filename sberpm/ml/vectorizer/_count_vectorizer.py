@@ -1,3 +1,22 @@
+# Numpy Python module is used in this file.
+#   Licence: BSD-3-Clause License
+#   Link: https://github.com/numpy/numpy
+
+# Pandas Python module is used in this file.
+#   Licence: BSD-3-Clause License
+#   Link: https://github.com/pandas-dev/pandas
+
+# Scipy Python module is used in this file.
+#   Licence: BSD-3-Clause License
+#   Link: https://github.com/scipy/scipy
+
+from scipy.sparse import csr_matrix
+import numpy as np
+import pandas as pd
+
+from ..._utils import import_cudf
+
+
 class ProcessCountVectorizer:
     """
     Class for vectorizing event traces using CountVectorizer algorithm.
@@ -12,6 +31,10 @@ class ProcessCountVectorizer:
         If True, returns pandas Dataframe with IDs as index and activities as columns,
         otherwise returns numpy ndarray.
 
+    engine: {'pandas', 'cudf'}, default='pandas'
+        If 'cudf', the activities are counted on GPU using RAPIDS cuDF.
+        If cuDF is not installed, the calculation is done on CPU.
+
     Examples
     --------
     >>> import pandas as pd
@@ -27,9 +50,12 @@ class ProcessCountVectorizer:
     >>> embeddings = vectorizer.transform(data_holder)
     """
 
-    def __init__(self, binary=False, return_dataframe=False):
+    def __init__(self, binary=False, return_dataframe=False, engine='pandas'):
+        if engine not in ['pandas', 'cudf']:
+            raise ValueError(f'Only "pandas" and "cudf" engines are supported, but received: "{engine}"')
         self._binary = binary
         self._return_dataframe = return_dataframe
+        self._engine = engine
 
     def transform(self, data_holder):
         """
@@ -45,9 +71,19 @@ class ProcessCountVectorizer:
         embeddings: pandas.DataFrame of numpy.ndarray, shape=[event_traces_num, unique_activities_num]
             List of vectorized event traces.
         """
-        embeddings = data_holder.data.groupby([data_holder.id_column, data_holder.activity_column]).size().unstack()
-        embeddings.fillna(0., inplace=True)
-        embeddings = embeddings.astype(int)  # convert to int from float
+        cudf = import_cudf(self._engine)
+        if cudf is None and getattr(data_holder, '_is_sorted_by_id', False):
+            embeddings = self._count_sorted(data_holder)
+        else:
+            columns = [data_holder.id_column, data_holder.activity_column]
+            if cudf is not None:
+                # Count on GPU, only the table of counts is moved back to CPU
+                counts = cudf.from_pandas(data_holder.data[columns]).groupby(columns).size().to_pandas()
+            else:
+                counts = data_holder.data.groupby(columns).size()
+            embeddings = counts.unstack()
+            embeddings.fillna(0., inplace=True)
+            embeddings = embeddings.astype(int)  # convert to int from float
 
         if self._binary:
             embeddings = embeddings.astype(bool).astype(int)
@@ -56,3 +92,31 @@ class ProcessCountVectorizer:
             embeddings = embeddings.values
 
         return embeddings
+
+    @staticmethod
+    def _count_sorted(data_holder):
+        """
+        Counts activities in the event traces in a single pass over the data
+        without grouping. The data must be sorted by id.
+
+        Parameters
+        ----------
+        data_holder : DataHolder
+            Object that contains the event log and the names of its necessary columns.
+
+        Returns
+        -------
+        embeddings: pandas.DataFrame, shape=[event_traces_num, unique_activities_num]
+            Activity counts with IDs as index and activities as columns.
+        """
+        ids = data_holder.data[data_holder.id_column].to_numpy()
+        codes, activities = pd.factorize(data_holder.data[data_holder.activity_column], sort=True)
+        # Indexes of the first events of the traces
+        boundaries = np.concatenate([[0], np.flatnonzero(ids[1:] != ids[:-1]) + 1]) if len(ids) > 0 \
+            else np.array([], dtype=int)
+        indptr = np.append(boundaries, len(ids))
+        counts = csr_matrix((np.ones_like(codes), codes, indptr), shape=(len(boundaries), len(activities)))
+        counts.sum_duplicates()
+        return pd.DataFrame(counts.toarray(),
+                            index=pd.Index(ids[boundaries], name=data_holder.id_column),
+                            columns=pd.Index(activities, name=data_holder.activity_column))
@@ -1,6 +1,15 @@
 from ._graph import load_graph
-from ._graphviz_painter import GraphvizPainter
-from ._chart_painter import ChartPainter
+
+
+def __getattr__(name):
+    # The painters pull in graphviz and plotly, so they are imported on first access only
+    if name == 'GraphvizPainter':
+        from ._graphviz_painter import GraphvizPainter
+        return GraphvizPainter
+    if name == 'ChartPainter':
+        from ._chart_painter import ChartPainter
+        return ChartPainter
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
 __all__ = ['GraphvizPainter', 'ChartPainter', 'load_graph']
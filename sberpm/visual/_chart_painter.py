@@ -10,35 +10,543 @@
 #   Licence: MIT License
 #   Link: https://github.com/plotly/plotly.py
 
+# IPython Python module is used in this file.
+#   Licence: BSD 3-Clause License
+#   Link: https://github.com/ipython/ipython/blob/master/LICENSE
+
+# Numba Python module is used in this file (optional).
+#   Licence: BSD-2-Clause License
+#   Link: https://github.com/numba/numba
+
 import numpy as np
 import pandas as pd
 import itertools
-import plotly.graph_objs as go
-import plotly.express as px
-import plotly.figure_factory as ff
-import plotly.io as pio
+import re
+from collections import namedtuple
 from .._holder import DataHolder
 from ..metrics import ActivityMetric, TransitionMetric, IdMetric, TraceMetric, UserMetric
 from copy import deepcopy
 from math import ceil
 from typing import Union, Optional, List, Tuple, NoReturn, Any
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Maximum number of distinct colors generated for a discrete palette,
+# plotly cycles the sequence for the remaining labels.
+_MAX_COLORS = 256
+
+# Number of points starting from which traces are rendered with WebGL instead of SVG
+_WEBGL_THRESHOLD = 5000
+
+# Arguments of groupby used for counting values: unused categories are skipped,
+# the groups are not sorted (only the selected counts are sorted afterwards)
+_VC_KWARGS = dict(sort=False, observed=True)
+
+# Plotly modules, they are imported on the first use (see _get_px and _get_go):
+# importing plotly.express alone takes several hundred milliseconds.
+_px = None
+_go = None
+
+
+def _get_px():
+    """
+    Returns the plotly.express module, it is imported on the first call.
+    """
+    global _px
+    if _px is None:
+        import plotly.express as px
+        _px = px
+    return _px
+
+
+def _get_go():
+    """
+    Returns the plotly.graph_objs module, it is imported on the first call.
+    """
+    global _go
+    if _go is None:
+        import plotly.graph_objs as go
+        _go = go
+    return _go
+
 
 def get_continuous_color(colorscale: List[list], intermed: float):
     if intermed <= 0 or len(colorscale) == 1:
         return colorscale[0][1]
     if intermed >= 1:
         return colorscale[-1][1]
+    from plotly.colors import find_intermediate_color
     for cutoff, color in colorscale:
         if intermed > cutoff:
             low_cutoff, low_color = cutoff, color
         else:
             high_cutoff, high_color = cutoff, color
             break
-    return px.colors.find_intermediate_color(lowcolor=low_color,
-                                             highcolor=high_color,
-                                             intermed=((intermed - low_cutoff) / (high_cutoff - low_cutoff)),
-                                             colortype='rgb')
+    return find_intermediate_color(lowcolor=low_color,
+                                   highcolor=high_color,
+                                   intermed=((intermed - low_cutoff) / (high_cutoff - low_cutoff)),
+                                   colortype='rgb')
+
+
+def _resolve_palette(palette: str) -> List[str]:
+    """
+    Returns a Plotly color palette by its name.
+
+    Parameters
+    ----------
+    palette: str
+        Name of the palette relative to 'plotly.express.colors',
+        e.g. 'sequential.Sunset_r'.
+
+    Returns
+    -------
+    colors: list of str
+    """
+    import plotly.colors
+    obj = plotly.colors
+    for attr in palette.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _nunique_fast(series: pd.Series) -> int:
+    """
+    Returns the number of unique non-null values of a column. For a categorical column
+    the used categories are counted on the integer codes (unused categories are not counted).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        return int(np.count_nonzero(np.bincount(codes[codes >= 0])))
+    uniques = pd.unique(series.to_numpy())
+    return uniques.size - int(pd.isna(uniques).sum())
+
+
+def _project(data: pd.DataFrame, *cols: Any) -> pd.DataFrame:
+    """
+    Returns only the columns of the data that are used in a graph.
+
+    Parameters
+    ----------
+    data: pandas.DataFrame
+
+    *cols: str or list of str or dict
+        Column names, lists of column names or dicts with column names
+        as keys (e.g. 'hover_data'). Other values are ignored.
+
+    Returns
+    -------
+    data: pandas.DataFrame
+    """
+    names = []
+    for col in cols:
+        if isinstance(col, (list, tuple, dict)):
+            names.extend(c for c in col if isinstance(c, str))
+        elif isinstance(col, str):
+            names.append(col)
+    names = [c for c in dict.fromkeys(names) if c in data.columns]
+    if len(names) == len(data.columns):
+        return data
+    return data[names]
+
+
+_BarAxes = namedtuple('_BarAxes', ['continuous', 'categorical', 'autorange', 'texttemplate'])
+
+# Axis with the values of the bars and its autorange, by whether 'y' is numeric
+_BAR_VALUE_AXIS = {True: ('y', True), False: ('x', 'reversed')}
+
+
+def _bar_axes(data: pd.DataFrame, x: Optional[Union[str, List[str]]], y: Optional[Union[str, List[str]]],
+              decimals: int) -> _BarAxes:
+    """
+    Determines the roles of the axes of a bar chart.
+
+    Parameters
+    ----------
+    data: pandas.DataFrame
+
+    x: str or list of str
+
+    y: str or list of str
+
+    decimals: int
+        Number of decimal places of the text labels of a float dtype.
+
+    Returns
+    -------
+    axes: _BarAxes
+        - continuous, categorical: names of the columns with the values and
+          the categories of the bars (None for wide-form data).
+        - autorange: autorange of the categorical axis.
+        - texttemplate: template of the text labels.
+    """
+    wide = isinstance(x, list) or isinstance(y, list)
+    y_first = y[0] if isinstance(y, list) else y
+    y_numeric = bool(y) and (isinstance(y, list) or not wide) and pd.api.types.is_numeric_dtype(data[y_first])
+    axis, autorange = _BAR_VALUE_AXIS[y_numeric]
+    value_cols = y if y_numeric else x
+    value_cols = [value_cols] if isinstance(value_cols, str) else value_cols or []
+    if value_cols and all(pd.api.types.is_integer_dtype(data[col]) for col in value_cols):
+        texttemplate = f'%{{{axis}:d}}'
+    else:
+        texttemplate = f'%{{{axis}:.{decimals}f}}'
+    if wide:
+        continuous, categorical = None, None
+    elif y_numeric:
+        continuous, categorical = y, x
+    else:
+        continuous, categorical = x, y
+    return _BarAxes(continuous, categorical, autorange, texttemplate)
+
+
+def _top_n(data: pd.DataFrame, sort: str, n: int) -> pd.DataFrame:
+    """
+    Returns the first 'n' rows of the data sorted by given column in descending order
+    if 'n' is positive or the first '-n' rows sorted in ascending order if 'n' is negative.
+    Numeric columns are handled with a partial sort, so ties may be ordered
+    differently than by a full sort.
+
+    Parameters
+    ----------
+    data: pandas.DataFrame
+
+    sort: str
+        Name of the column to sort values by.
+
+    n: int
+        Number of rows to return.
+
+    Returns
+    -------
+    data: pandas.DataFrame
+    """
+    if pd.api.types.is_numeric_dtype(data[sort]) and not pd.api.types.is_bool_dtype(data[sort]):
+        return data.nlargest(n, sort) if n > 0 else data.nsmallest(-n, sort)
+    return data.sort_values(by=sort, ascending=n < 0).head(abs(n))
+
+
+def _bin_counts(values: np.ndarray, nbins: int, codes: Optional[np.ndarray] = None,
+                n_groups: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Counts the values in equal-width bins from the minimum to the maximum value.
+
+    Parameters
+    ----------
+    values: numpy.ndarray of float, shape=[N]
+        Values without NaNs.
+
+    nbins: int
+        Number of bins.
+
+    codes: numpy.ndarray of int, shape=[N], default=None
+        Group codes of the values (from 0 to n_groups - 1).
+
+    n_groups: int, default=1
+        Number of groups.
+
+    Returns
+    -------
+    edges: numpy.ndarray of float, shape=[nbins + 1]
+        Edges of the bins.
+
+    counts: numpy.ndarray of int, shape=[n_groups, nbins]
+        Number of values in every bin for every group.
+    """
+    xmin, xmax = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+    if xmax == xmin:
+        xmin, xmax = xmin - 0.5, xmax + 0.5
+    edges = np.linspace(xmin, xmax, nbins + 1)
+    idx = np.clip(((values - xmin) / (xmax - xmin) * nbins).astype(np.int64), 0, nbins - 1)
+    if codes is not None:
+        idx = codes * nbins + idx
+    counts = np.bincount(idx, minlength=n_groups * nbins).reshape(n_groups, nbins)
+    return edges, counts
+
+
+def _top_k(counts: np.ndarray, n: Optional[int]) -> np.ndarray:
+    """
+    Returns the positions of the 'n' largest counts if 'n' is positive or of the '-n'
+    smallest counts if 'n' is negative (all counts if 'n' is None). Only the selected
+    counts are sorted, the positions are returned in descending order of the counts.
+
+    Parameters
+    ----------
+    counts: numpy.ndarray of int or float
+
+    n: int, default=None
+
+    Returns
+    -------
+    positions: numpy.ndarray of int
+    """
+    k = abs(n) if n else len(counts)
+    if k < len(counts):
+        positions = np.argpartition(-counts if n > 0 else counts, k)[:k]
+    else:
+        positions = np.arange(len(counts))
+    return positions[np.argsort(-counts[positions], kind='stable')]
+
+
+def _pie_frame(labels: str, values: str, keys: np.ndarray, vals: np.ndarray, idx: np.ndarray,
+               remainder: bool) -> pd.DataFrame:
+    """
+    Builds the data of a pie chart from the selected sectors. The rest of the values
+    are summed up into the 'Other' sector if 'remainder' is True.
+
+    Parameters
+    ----------
+    labels: str
+        Name of the column with the labels of the sectors.
+
+    values: str
+        Name of the column with the values of the sectors.
+
+    keys: numpy.ndarray of object, shape=[N]
+        Labels of all the sectors.
+
+    vals: numpy.ndarray, shape=[N]
+        Values of all the sectors.
+
+    idx: numpy.ndarray of int
+        Positions of the selected sectors.
+
+    remainder: bool
+        Whether to add the 'Other' sector.
+
+    Returns
+    -------
+    data: pandas.DataFrame
+    """
+    shown = vals[idx]
+    other = 0
+    # the rest is summed directly (not as a difference of sums, which is not exactly 0
+    # for floats when all the sectors are shown) and only when the 'Other' sector is needed
+    if remainder and len(idx) < len(vals):
+        rest = np.ones(len(vals), dtype=bool)
+        rest[idx] = False
+        other = np.nansum(vals[rest])
+    if other > 0:
+        shown_keys = np.empty(len(idx) + 1, dtype=object)
+        shown_keys[:-1], shown_keys[-1] = keys[idx], 'Other'
+        return pd.DataFrame({labels: shown_keys, values: np.append(shown, other)})
+    return pd.DataFrame({labels: keys[idx], values: shown})
+
+
+def _parse_colorscale(colorscale: List[list]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts a colorscale to numpy arrays.
+
+    Parameters
+    ----------
+    colorscale: list of [float, str]
+        Colorscale with colors in 'rgb(r, g, b)' format.
+
+    Returns
+    -------
+    cutoffs: numpy.ndarray of float, shape=[K]
+        Positions of the colors in the colorscale.
+
+    rgb: numpy.ndarray of float, shape=[K, 3]
+        Colors of the colorscale.
+    """
+    cutoffs = np.array([cutoff for cutoff, _ in colorscale], dtype=np.float64)
+    rgb = np.array([[float(c) for c in re.findall(r'[\d.]+', color)[:3]] for _, color in colorscale],
+                   dtype=np.float64)
+    return cutoffs, rgb
+
+
+def _interp_rgb_loop(cutoffs, rgb, intermeds, out):
+    """
+    Linearly interpolates the colors of a colorscale at given positions
+    in a single pass without temporary arrays.
+
+    Parameters
+    ----------
+    cutoffs: np.ndarray of float, shape=[K]
+        Positions of the colors in the colorscale, K >= 2.
+
+    rgb: np.ndarray of float, shape=[K, 3]
+        Colors of the colorscale.
+
+    intermeds: np.ndarray of float, shape=[N]
+        Positions to find the colors at.
+
+    out: np.ndarray of float, shape=[N, 3]
+        Array the colors are written to.
+    """
+    k = len(cutoffs)
+    for i in range(len(intermeds)):
+        pos = min(max(intermeds[i], cutoffs[0]), cutoffs[k - 1])
+        lo, hi = 0, k
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if cutoffs[mid] <= pos:
+                lo = mid + 1
+            else:
+                hi = mid
+        j = min(max(lo - 1, 0), k - 2)
+        t = (pos - cutoffs[j]) / (cutoffs[j + 1] - cutoffs[j])
+        for c in range(3):
+            out[i, c] = rgb[j, c] * (1 - t) + rgb[j + 1, c] * t
+
+
+def _interp_rgb_numpy(cutoffs, rgb, intermeds, out):
+    """
+    The same as _interp_rgb_loop, but vectorized with numpy (used if numba is not installed).
+    """
+    intermeds = np.clip(intermeds, cutoffs[0], cutoffs[-1])
+    idx = np.clip(np.searchsorted(cutoffs, intermeds, side='right') - 1, 0, len(cutoffs) - 2)
+    t = ((intermeds - cutoffs[idx]) / (cutoffs[idx + 1] - cutoffs[idx]))[:, None]
+    out[:] = rgb[idx] * (1 - t) + rgb[idx + 1] * t
+
+
+_interp_rgb = njit(cache=True)(_interp_rgb_loop) if njit is not None else _interp_rgb_numpy
+
+
+def _interp_colors(cutoffs: np.ndarray, rgb: np.ndarray, intermeds: np.ndarray) -> List[str]:
+    """
+    Finds the colors at given positions of a parsed colorscale (see _parse_colorscale).
+    """
+    intermeds = np.asarray(intermeds, dtype=np.float64)
+    if len(cutoffs) == 1:
+        rgb_out = np.repeat(rgb, len(intermeds), axis=0)
+    else:
+        rgb_out = np.empty((len(intermeds), 3), dtype=np.float64)
+        _interp_rgb(cutoffs, rgb, intermeds, rgb_out)
+    return ['rgb(%s, %s, %s)' % (r, g, b) for r, g, b in rgb_out.tolist()]
+
+
+def get_continuous_colors(colorscale: List[list], intermeds: np.ndarray) -> List[str]:
+    """
+    Vectorized version of get_continuous_color: finds the colors at all given positions at once.
+
+    Parameters
+    ----------
+    colorscale: list of [float, str]
+        Colorscale with colors in 'rgb(r, g, b)' format.
+
+    intermeds: array-like of float
+        Positions in the colorscale, from 0 to 1.
+
+    Returns
+    -------
+    colors: list of str
+        Colors in 'rgb(r, g, b)' format.
+    """
+    return _interp_colors(*_parse_colorscale(colorscale), intermeds)
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Selects points of a series using the Largest-Triangle-Three-Buckets algorithm.
+
+    Parameters
+    ----------
+    x: numpy.ndarray of float
+        X coordinates of the points.
+
+    y: numpy.ndarray of float
+        Y coordinates of the points.
+
+    n_out: int
+        Number of points to select.
+
+    Returns
+    -------
+    indexes: numpy.ndarray of int
+        Sorted indexes of the selected points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # The first and the last points are always kept, the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indexes = np.empty(n_out, dtype=np.int64)
+    indexes[0], indexes[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Double area of the triangles formed by the previous selected point, bucket points and next bucket average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indexes[i + 1] = a
+    return indexes
+
+
+def _maybe_downsample(data: pd.DataFrame, x: Any, y: Any, max_points: Optional[int],
+                      by: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Downsamples the rows of the data with LTTB if there are more than 'max_points' of them.
+    Only numeric (or datetime) 'x' and numeric 'y' columns are supported,
+    otherwise the data is returned unchanged. The rows of a downsampled
+    trace are returned sorted by 'x'.
+
+    Parameters
+    ----------
+    data: pandas.DataFrame
+        Data to downsample.
+
+    x: str
+        Name of the column drawn on the x-axis.
+
+    y: str
+        Name of the column drawn on the y-axis.
+
+    max_points: int or None
+        Maximum number of rows to keep. If None, the data is not downsampled.
+
+    by: list of str, default=None
+        Columns that split the data into separate traces, each trace
+        is downsampled on its own.
+
+    Returns
+    -------
+    data: pandas.DataFrame
+    """
+    if max_points is None or len(data) <= max_points or not isinstance(x, str) or not isinstance(y, str):
+        return data
+    if not (pd.api.types.is_numeric_dtype(data[x]) or pd.api.types.is_datetime64_any_dtype(data[x])) \
+            or not pd.api.types.is_numeric_dtype(data[y]):
+        return data
+    data = data.dropna(subset=[x, y])
+    by = [col for col in (by or []) if isinstance(col, str)]
+    groups = data.groupby(by, sort=False, dropna=False) if by else [(None, data)]
+    parts = []
+    for _, group in groups:
+        # LTTB buckets consecutive points, so they must be ordered by x
+        if not group[x].is_monotonic_increasing:
+            group = group.sort_values(x, kind='stable')
+        n_out = max(3, int(max_points * len(group) / len(data)))
+        if pd.api.types.is_datetime64_any_dtype(data[x]):
+            # tz-aware columns give an object array with to_numpy(), so they are converted to UTC first
+            x_values = group[x].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        else:
+            x_values = group[x].to_numpy()
+        indexes = _lttb(x_values.astype(np.float64), group[y].to_numpy(dtype=np.float64), n_out)
+        parts.append(group.iloc[indexes])
+    return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+
+def _figure_widget(fig: 'go.Figure') -> Optional['go.FigureWidget']:
+    """
+    Returns the figure as a FigureWidget, or None if it cannot be displayed
+    (ipywidgets is not installed or the code does not run in IPython).
+    """
+    try:
+        from IPython import get_ipython
+    except ImportError:
+        return None
+    if get_ipython() is None:
+        return None
+    try:
+        return _get_go().FigureWidget(fig)
+    except ImportError:
+        return None
 
 
 class ChartPainter:
@@ -79,6 +587,7 @@ class ChartPainter:
                  template: str = 'plotly',
                  palette: str = 'sequential.Sunset_r',
                  shape_color: str = 'lime') -> None:
+        from plotly.colors import convert_colors_to_same_type, make_colorscale
         self._dh = None
         if type(data) is DataHolder:
             self._data = data.data
@@ -89,12 +598,18 @@ class ChartPainter:
             self._data = data
         else:
             raise TypeError
-        pio.templates.default = template
-        px.defaults.color_discrete_sequence = eval('px.colors.' + palette)
-        px.defaults.color_continuous_scale = eval('px.colors.' + palette)
-        self._colors, _ = px.colors.convert_colors_to_same_type(eval('px.colors.' + palette))
-        self._colorscale = px.colors.make_colorscale(self._colors)
+        self._template = template
+        self._pal = _resolve_palette(palette)
+        self._colors, _ = convert_colors_to_same_type(self._pal)
+        self._colorscale = make_colorscale(self._colors)
         self._newshape_line_color = shape_color
+        # colors of line, pie, sunburst and gantt are sampled from the palette even
+        # when plotly's qualitative sequence has enough colors for the labels
+        self._force_continuous_palette = False
+        self._nunique_cache = {}
+        self._kind_cache = {}
+        self._last_figs = {}
+        self._displayed_figs = set()
 
         self._config = dict(toImageButtonOptions=dict(format='png',
                                                       height=None,
@@ -108,6 +623,216 @@ class ChartPainter:
                                                  'eraseshape'],
                             showLink=True)
 
+    @property
+    def _colorscale(self) -> List[list]:
+        """
+        Colorscale of the painter. Setting it rebuilds the parsed colorscale arrays
+        (self._cs_cutoffs, self._cs_rgb) and clears the cached color sequences.
+        """
+        return self._cs
+
+    @_colorscale.setter
+    def _colorscale(self, colorscale: List[list]) -> NoReturn:
+        self._cs = colorscale
+        self._cs_cutoffs, self._cs_rgb = _parse_colorscale(colorscale)
+        self._seq_cache = {}
+
+    def _px_kwargs(self, kwargs: dict, continuous: bool = False) -> dict:
+        """
+        Adds the template and the palette of the painter to the arguments
+        of a plotly express function unless they are given by the user.
+        Plotly's global defaults are not changed.
+
+        Parameters
+        ----------
+        kwargs: dict
+            Arguments given by the user.
+
+        continuous: bool, default=False
+            Whether the function takes a continuous colorscale.
+
+        Returns
+        -------
+        kwargs: dict
+        """
+        defaults = dict(template=self._template)
+        if continuous:
+            defaults['color_continuous_scale'] = self._pal
+        return {**defaults, **kwargs}
+
+    def _show(self, method: str, fig: 'go.Figure', show: bool, reuse: bool) -> 'go.Figure':
+        """
+        Displays a figure made by a method. If 'reuse' is True, the figure is drawn
+        in a FigureWidget that is kept and updated in place by the next calls
+        of the method with reuse=True, so the notebook output is not redrawn.
+        The widget is returned even if it is not shown and is displayed
+        by the first call with show=True. Without ipywidgets or outside IPython the figure is shown as usual.
+
+        Parameters
+        ----------
+        method: str
+            Name of the method that made the figure.
+
+        fig: plotly.graph_objects.Figure
+
+        show: bool
+            Whether to display the figure.
+
+        reuse: bool
+            Whether to update the previous figure of the method.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure or plotly.graph_objects.FigureWidget
+            The figure that is displayed.
+        """
+        if reuse:
+            widget = self._last_figs.get(method)
+            if widget is not None:
+                # The displayed widget is updated in place
+                widget.update(data=fig.data, layout=fig.layout, overwrite=True)
+            else:
+                widget = _figure_widget(fig)
+            if widget is not None:
+                self._last_figs[method] = widget
+                if show and method not in self._displayed_figs:
+                    from IPython.display import display
+                    display(widget)
+                    self._displayed_figs.add(method)
+                return widget
+        if show:
+            fig.show(config=self._config)
+        return fig
+
+    def _color_seq(self, len_labels: int) -> List[str]:
+        """
+        Returns a sequence of colors evenly sampled from the colorscale.
+        The sequences are cached, so repeated plots reuse them.
+
+        Parameters
+        ----------
+        len_labels: int
+            Number of labels. At most _MAX_COLORS colors are generated,
+            plotly cycles them for the rest of the labels.
+
+        Returns
+        -------
+        colors: list of str
+        """
+        len_labels = min(len_labels, _MAX_COLORS)
+        if len_labels not in self._seq_cache:
+            step = 1.0 / max(len_labels - 1, 1)
+            self._seq_cache[len_labels] = _interp_colors(self._cs_cutoffs, self._cs_rgb,
+                                                         [i * step for i in range(len_labels)])
+        return self._seq_cache[len_labels]
+
+    def _discrete_seq(self, len_labels: int) -> Optional[List[str]]:
+        """
+        Returns a sequence of colors for the labels of a discrete color column.
+        If there are not more labels than colors in plotly's qualitative sequence,
+        None is returned and plotly uses the colorway of the template,
+        unless self._force_continuous_palette is True.
+
+        Parameters
+        ----------
+        len_labels: int
+            Number of labels.
+
+        Returns
+        -------
+        colors: list of str or None
+        """
+        if not self._force_continuous_palette and len_labels <= len(_get_px().colors.qualitative.Plotly):
+            return None
+        return self._color_seq(len_labels)
+
+    def _nunique(self, data: pd.DataFrame, col: str) -> int:
+        """
+        Returns the number of unique values of a column. The result is cached
+        when the data is the painter's data frame or its projection, the cache key
+        contains id(self._data), so it is not reused if the data is replaced.
+
+        Parameters
+        ----------
+        data: pandas.DataFrame
+
+        col: str
+            Name of the column.
+
+        Returns
+        -------
+        nunique: int
+        """
+        if not isinstance(self._data, pd.DataFrame) or data.index is not self._data.index:
+            return _nunique_fast(data[col])
+        key = (id(self._data), col)
+        if key not in self._nunique_cache:
+            self._nunique_cache[key] = _nunique_fast(data[col])
+        return self._nunique_cache[key]
+
+    def _as_categorical(self, data: pd.DataFrame, *cols: Optional[str]) -> pd.DataFrame:
+        """
+        Converts the string columns of the data that have few unique values
+        (less than 10% of the rows) to the categorical dtype, so that counting
+        and grouping them works with integer codes. The data must be already
+        filtered: only the values present in it become categories. Neither
+        the painter's data frame nor the given one is changed.
+
+        Parameters
+        ----------
+        data: pandas.DataFrame
+            Data of a graph.
+
+        *cols: str
+            Names of the columns, None values are ignored.
+
+        Returns
+        -------
+        data: pandas.DataFrame
+            Shallow copy of the data with the converted columns (or the data itself).
+        """
+        converted = {}
+        for col in cols:
+            if col is None or col not in data.columns or data[col].dtype.kind != 'O':
+                continue
+            if self._nunique(data, col) < len(data) / 10:
+                converted[col] = data[col].astype('category')
+        if converted:
+            data = data.copy(deep=False)
+            for col, values in converted.items():
+                data[col] = values
+        return data
+
+    def _kind(self, data: pd.DataFrame, col: str) -> str:
+        """
+        Returns the dtype kind of a column (see numpy.dtype.kind), e.g. 'i' or 'u' for
+        integers, 'f' for floats, 'O' for objects. The data must be the painter's data
+        or made from it by selecting rows and columns, the kinds are cached with
+        the key containing id(self._data), so they are not reused if the data is replaced.
+
+        Parameters
+        ----------
+        data: pandas.DataFrame
+
+        col: str
+            Name of the column.
+
+        Returns
+        -------
+        kind: str
+        """
+        key = (id(self._data), col)
+        if key not in self._kind_cache:
+            self._kind_cache[key] = data[col].dtype.kind
+        return self._kind_cache[key]
+
+    def _color_array(self, n: int) -> List[str]:
+        """
+        Returns exactly n colors evenly sampled from the colorscale,
+        e.g. for coloring every bar of a trace.
+        """
+        return _interp_colors(self._cs_cutoffs, self._cs_rgb, np.arange(n) / max(n - 1, 1))
+
     def hist(self, x: Union[str, List[str]],
              color: Optional[str] = None,
              subplots: Optional[Tuple[str, str, int]] = None,
@@ -122,7 +847,10 @@ class ChartPainter:
              height: Optional[int] = None,
              width: Optional[int] = None,
              font_size: int = 12,
-             **kwargs: Optional[Any]) -> NoReturn:
+             precompute: bool = True,
+             show: bool = True,
+             reuse: bool = False,
+             **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Plots a histogram.
 
@@ -181,11 +909,36 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        precompute: bool, default=True
+            Whether to count the values in bins before passing them to plotly,
+            so that only the heights of the bars are sent to the browser.
+            The bins have equal width from the minimum to the maximum value.
+            It is used for a single numeric column when no subplots
+            and no other arguments (**kwargs) are given.
+
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.histogram' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
         cols_or_lists = [el for el in [x, color, list(subplots[:2]) if subplots is not None else []] if el is not None]
         data = self._get_data(list(itertools.chain(*[[el] if isinstance(el, str) else el for el in cols_or_lists])))
+        data = _project(data, *cols_or_lists, *kwargs.values())
+        x_is_list = isinstance(x, list)
         # data = self._data
         if barmode == 'stack':
             barmode = 'relative'
@@ -199,35 +952,40 @@ class ChartPainter:
         else:
             facet_row, facet_col, facet_col_wrap = None, None, None
         if color:
-            len_labels = data[color].nunique()
-            nums = np.linspace(0, len_labels, len_labels) / len_labels
-            color_discrete_sequence = [get_continuous_color(self._colorscale, z) for z in nums]
+            color_discrete_sequence = self._color_seq(self._nunique(data, color))
         else:
             color_discrete_sequence = None
-        fig = px.histogram(data_frame=data,
-                           x=x,
-                           y=y,
-                           color=color,
-                           facet_row=facet_row,
-                           facet_col=facet_col,
-                           facet_col_wrap=facet_col_wrap,
-                           color_discrete_sequence=color_discrete_sequence,
-                           barmode=barmode,
-                           nbins=nbins,
-                           cumulative=cumulative,
-                           opacity=opacity,
-                           orientation=orientation,
-                           height=height,
-                           width=width,
-                           **kwargs)
+        col = x if orientation == 'v' else y
+        if precompute and not subplots and not kwargs and isinstance(col, str) \
+                and pd.api.types.is_numeric_dtype(data[col]) and not pd.api.types.is_bool_dtype(data[col]):
+            fig = self._hist_precomputed(data, col, color, color_discrete_sequence or self._pal, barmode,
+                                         nbins, cumulative, orientation, opacity)
+            fig.update_layout(height=height, width=width, template=self._template)
+        else:
+            fig = px.histogram(data_frame=data,
+                               x=x,
+                               y=y,
+                               color=color,
+                               facet_row=facet_row,
+                               facet_col=facet_col,
+                               facet_col_wrap=facet_col_wrap,
+                               color_discrete_sequence=color_discrete_sequence or self._pal,
+                               barmode=barmode,
+                               nbins=nbins,
+                               cumulative=cumulative,
+                               opacity=opacity,
+                               orientation=orientation,
+                               height=height,
+                               width=width,
+                               **self._px_kwargs(kwargs))
         if edge:
             fig.update_traces(marker_line=dict(color='black', width=1))
         if title == 'auto':
-            if type(x) != list:
-                title = f'Histogram of {x}'
+            if not x_is_list:
+                title = f'Histogram of {col}'
             else:
                 title = 'Histogram'
-        if type(x) == list:
+        if x_is_list:
             legend = dict(orientation='h', x=0.5, xanchor='center', y=1.01, yanchor='bottom', title=None)
             margin = dict(l=5, r=5, t=80, b=5)
         else:
@@ -240,7 +998,45 @@ class ChartPainter:
                           newshape_line_color=self._newshape_line_color)
         if slider:
             fig.update_xaxes(rangeslider_visible=True)
-        fig.show(config=self._config)
+        return self._show('hist', fig, show, reuse)
+
+    @staticmethod
+    def _hist_precomputed(data: pd.DataFrame, col: str, color: Optional[str],
+                          color_discrete_sequence: Optional[List[str]], barmode: str, nbins: int,
+                          cumulative: bool, orientation: str, opacity: float) -> 'go.Figure':
+        """
+        Plots a histogram of a numeric column from the bin counts calculated with numpy.
+        """
+        go = _get_go()
+        mask = data[col].notna().to_numpy()
+        if color:
+            mask &= data[color].notna().to_numpy()
+            codes, labels = pd.factorize(data[color][mask])
+        else:
+            codes, labels = None, [None]
+        values = data[col].to_numpy(dtype=np.float64)[mask]
+        edges, counts = _bin_counts(values, nbins, codes, len(labels))
+        if cumulative:
+            counts = counts.cumsum(axis=1)
+        centers = (edges[:-1] + edges[1:]) / 2
+        width = edges[1] - edges[0]
+        fig = go.Figure()
+        for i, label in enumerate(labels):
+            bar = dict(width=width, opacity=opacity, orientation=orientation, showlegend=color is not None,
+                       name=None if label is None else str(label))
+            if color_discrete_sequence:
+                bar['marker_color'] = color_discrete_sequence[i % len(color_discrete_sequence)]
+            if orientation == 'v':
+                fig.add_trace(go.Bar(x=centers, y=counts[i], **bar))
+            else:
+                fig.add_trace(go.Bar(x=counts[i], y=centers, **bar))
+        axis_titles = (col, 'count') if orientation == 'v' else ('count', col)
+        fig.update_layout(barmode=barmode,
+                          bargap=0,
+                          legend_title_text=color,
+                          xaxis_title=axis_titles[0],
+                          yaxis_title=axis_titles[1])
+        return fig
 
     def bar(self, x: Optional[Union[str, List[str]]] = None,
             y: Optional[Union[str, List[str]]] = None,
@@ -261,7 +1057,10 @@ class ChartPainter:
             height: Optional[int] = None,
             width: Optional[int] = None,
             font_size: int = 12,
-            **kwargs: Optional[Any]) -> NoReturn:
+            shared_y: bool = False,
+            show: bool = True,
+            reuse: bool = False,
+            **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a bar chart.
 
@@ -308,7 +1107,7 @@ class ChartPainter:
 
         add_line: list of str, default=None
             List of column names to add line to the graph for. Each line
-            will be drawn along a separate y-axis.
+            will be drawn along a separate y-axis (see 'shared_y').
 
         text: bool, default=False
             Whether to show text labels in the figure.
@@ -342,49 +1141,41 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        shared_y: bool, default=False
+            If True, the lines of 'add_line' share one y-axis and are drawn
+            as a single trace, which is faster to render for many lines.
+
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.bar' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
+        go = _get_go()
         if x is None and y is None:
             raise ValueError("Either 'x' or 'y' must be given")
 
         cols_or_lists = [x, y, sort, color, list(subplots[:2]) if subplots is not None else [], add_line]
         cols_or_lists = [el for el in cols_or_lists if el is not None]
         data = self._get_data(list(itertools.chain(*[[el] if isinstance(el, str) else el for el in cols_or_lists])))
-        if sort:
-            if n > 0:
-                data = data.sort_values(by=sort, ascending=False).head(n)
-            elif n < 0:
-                data = data.sort_values(by=sort, ascending=True).head(n)
-        if type(x) != list and type(y) != list:
-            if y and pd.api.types.is_numeric_dtype(data[y]):
-                continuous, categorical = y, x
-                autorange = True
-                if pd.api.types.is_integer_dtype(data[y]):
-                    texttemplate = '%{y:d}'
-                else:
-                    texttemplate = f'%{{y:.{decimals}f}}'
-            else:
-                continuous, categorical = x, y
-                autorange = 'reversed'
-                if pd.api.types.is_integer_dtype(data[x]):
-                    texttemplate = '%{x:d}'
-                else:
-                    texttemplate = f'%{{x:.{decimals}f}}'
-        else:
-            continuous, categorical = None, None
-            if y and type(y) == list and pd.api.types.is_numeric_dtype(data[y[0]]):
-                if pd.api.types.is_integer_dtype(data[y]):
-                    texttemplate = '%{y:d}'
-                else:
-                    texttemplate = f'%{{y:.{decimals}f}}'
-                autorange = True
-            else:
-                if pd.api.types.is_integer_dtype(data[x]):
-                    texttemplate = '%{x:d}'
-                else:
-                    texttemplate = f'%{{x:.{decimals}f}}'
-                autorange = 'reversed'
+        data = _project(data, *cols_or_lists, *kwargs.values())
+        x_is_list, y_is_list = isinstance(x, list), isinstance(y, list)
+        if sort and n:
+            data = _top_n(data, sort, n)
+        continuous, categorical, autorange, texttemplate = _bar_axes(data, x, y, decimals)
         if barmode == 'stack':
             barmode = 'relative'
         if orientation == 'auto':
@@ -393,19 +1184,23 @@ class ChartPainter:
             facet_row, facet_col, facet_col_wrap = subplots[0], subplots[1], subplots[2]
         else:
             facet_row, facet_col, facet_col_wrap = None, None, None
+        color_continuous_scale = None
         if color:
-            len_labels = data[color].nunique()
-            nums = np.linspace(0, len_labels, len_labels) / len_labels
-            color_discrete_sequence = [get_continuous_color(self._colorscale, z) for z in nums]
+            color_discrete_sequence = self._color_seq(self._nunique(data, color))
             color_discrete_map = {}
         else:
             color_discrete_map = {}
             color_discrete_sequence = None
-            if categorical and data[categorical].nunique() == len(data):
-                len_labels = len(data[categorical])
-                nums = np.linspace(0, len_labels, len_labels) / len_labels
-                color = [get_continuous_color(self._colorscale, z) for z in nums]
-                color_discrete_map = 'identity'
+            if categorical and data[categorical].is_unique:
+                if agg:
+                    color = self._color_array(len(data))
+                    color_discrete_map = 'identity'
+                elif not add_line:
+                    # One color per bar: the row position is mapped by the colorscale
+                    data = data.assign(_rowpos=np.arange(len(data)))
+                    color = '_rowpos'
+                    color_continuous_scale = self._colors
+                    kwargs.setdefault('hover_data', {'_rowpos': False})
         if add_line:
             opacity = 0.8
             color = None
@@ -419,7 +1214,7 @@ class ChartPainter:
                                facet_row=facet_row,
                                facet_col=facet_col,
                                facet_col_wrap=facet_col_wrap,
-                               color_discrete_sequence=color_discrete_sequence,
+                               color_discrete_sequence=color_discrete_sequence or self._pal,
                                color_discrete_map=color_discrete_map,
                                barmode=barmode,
                                opacity=opacity,
@@ -427,7 +1222,7 @@ class ChartPainter:
                                orientation=orientation,
                                height=height,
                                width=width,
-                               **kwargs)
+                               **self._px_kwargs(kwargs))
             fig.update_layout(bargap=0.2)
         else:
             fig = px.bar(data_frame=data,
@@ -437,15 +1232,21 @@ class ChartPainter:
                          facet_row=facet_row,
                          facet_col=facet_col,
                          facet_col_wrap=facet_col_wrap,
-                         color_discrete_sequence=color_discrete_sequence,
+                         color_discrete_sequence=color_discrete_sequence or self._pal,
                          color_discrete_map=color_discrete_map,
+                         color_continuous_scale=color_continuous_scale or self._pal,
                          barmode=barmode,
                          opacity=opacity,
                          orientation=orientation,
                          height=height,
                          width=width,
-                         **kwargs)
-            if add_line and continuous and categorical:
+                         **self._px_kwargs(kwargs))
+            if color_continuous_scale is not None:
+                fig.update_layout(coloraxis_showscale=False)
+            if add_line and continuous and categorical and shared_y:
+                fig.data[-1].name = continuous
+                self._add_shared_lines(fig, data, categorical, add_line, categorical == x)
+            elif add_line and continuous and categorical:
                 fig.data[-1].name = continuous
                 layout_a = {}
                 for i, a in enumerate(add_line):
@@ -489,7 +1290,7 @@ class ChartPainter:
                 title = f'Bar Chart of {continuous}'
             else:
                 title = 'Bar Chart'
-        if type(x) == list or type(y) == list or add_line:
+        if x_is_list or y_is_list or add_line:
             legend = dict(orientation='h', x=0.5, xanchor='center', y=1.01, yanchor='bottom', title=None)
             margin = dict(l=5, r=5, t=80, b=5)
         else:
@@ -503,7 +1304,44 @@ class ChartPainter:
                           newshape_line_color=self._newshape_line_color)
         if slider:
             fig.update_xaxes(rangeslider_visible=True)
-        fig.show(config=self._config)
+        return self._show('bar', fig, show, reuse)
+
+    @staticmethod
+    def _add_shared_lines(fig: 'go.Figure', data: pd.DataFrame, categorical: str, add_line: List[str],
+                          vertical: bool) -> NoReturn:
+        """
+        Adds the lines of the given columns to a bar chart as a single trace
+        along one additional y-axis, the lines are separated by None values.
+        """
+        px = _get_px()
+        go = _get_go()
+        n_rows = len(data)
+        categories = np.empty((len(add_line), n_rows + 1), dtype=object)
+        categories[:, :n_rows] = data[categorical].to_numpy()
+        categories[:, n_rows] = None
+        values = np.empty((len(add_line), n_rows + 1), dtype=object)
+        values[:, :n_rows] = data[add_line].to_numpy().T
+        values[:, n_rows] = None
+        categories, values = categories.ravel()[:-1], values.ravel()[:-1]
+        x_a, y_a = (categories, values) if vertical else (values, categories)
+        name = ', '.join(add_line)
+        line_color = px.colors.qualitative.Plotly[1]
+        fig.add_trace(go.Scatter(x=x_a,
+                                 y=y_a,
+                                 name=name,
+                                 mode='lines',
+                                 marker_color=line_color,
+                                 line_width=3,
+                                 yaxis='y2'))
+        fig.update_traces(hovertemplate=None,
+                          showlegend=True)
+        fig.update_layout(hovermode='x',
+                          yaxis2=dict(title=name,
+                                      overlaying='y',
+                                      side='right',
+                                      showgrid=False,
+                                      titlefont_color=line_color,
+                                      tickfont_color=line_color))
 
     def box(self, x: Optional[Union[str, List[str]]] = None,
             y: Optional[Union[str, List[str]]] = None,
@@ -516,7 +1354,9 @@ class ChartPainter:
             height: Optional[int] = None,
             width: Optional[int] = None,
             font_size: int = 12,
-            **kwargs: Optional[Any]) -> NoReturn:
+            show: bool = True,
+            reuse: bool = False,
+            **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a box plot.
 
@@ -570,15 +1410,35 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.box' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
         if x is None and y is None:
             raise ValueError("Either 'x' or 'y' must be given")
 
         cols_or_lists = [x, y, color, list(subplots[:2]) if subplots is not None else []]
         cols_or_lists = [el for el in cols_or_lists if el is not None]
         data = self._get_data(list(itertools.chain(*[[el] if isinstance(el, str) else el for el in cols_or_lists])))
+        data = _project(data, *cols_or_lists, *kwargs.values())
+        x_is_list, y_is_list = isinstance(x, list), isinstance(y, list)
+        dtx = data[x].dtype if isinstance(x, str) else None
+        dty = data[y].dtype if isinstance(y, str) else None
 
         if orientation == 'auto':
             orientation = None
@@ -587,9 +1447,7 @@ class ChartPainter:
         else:
             facet_row, facet_col, facet_col_wrap = None, None, None
         if color:
-            len_labels = data[color].nunique()
-            nums = np.linspace(0, len_labels, len_labels) / len_labels
-            color_discrete_sequence = [get_continuous_color(self._colorscale, z) for z in nums]
+            color_discrete_sequence = self._color_seq(self._nunique(data, color))
         else:
             color_discrete_sequence = None
         fig = px.box(data_frame=data,
@@ -600,16 +1458,16 @@ class ChartPainter:
                      facet_col=facet_col,
                      facet_col_wrap=facet_col_wrap,
                      boxmode=boxmode,
-                     color_discrete_sequence=color_discrete_sequence,
+                     color_discrete_sequence=color_discrete_sequence or self._pal,
                      points=points,
                      orientation=orientation,
                      height=height,
                      width=width,
-                     **kwargs)
+                     **self._px_kwargs(kwargs))
         if title == 'auto':
-            if y and type(y) != list and pd.api.types.is_numeric_dtype(data[y]):
+            if y and not y_is_list and pd.api.types.is_numeric_dtype(dty):
                 title = f'Box Plot of {y}'
-            elif x and type(x) != list and pd.api.types.is_numeric_dtype(data[x]):
+            elif x and not x_is_list and pd.api.types.is_numeric_dtype(dtx):
                 title = f'Box Plot of {x}'
             else:
                 title = 'Box Plot'
@@ -617,7 +1475,7 @@ class ChartPainter:
                           margin=dict(l=5, r=5, t=50, b=5),
                           font_size=font_size,
                           newshape_line_color=self._newshape_line_color)
-        fig.show(config=self._config)
+        return self._show('box', fig, show, reuse)
 
     def scatter(self, x: Optional[Union[str, List[str]]] = None,
                 y: Optional[Union[str, List[str]]] = None,
@@ -638,7 +1496,11 @@ class ChartPainter:
                 height: Optional[int] = None,
                 width: Optional[int] = None,
                 font_size: int = 12,
-                **kwargs: Optional[Any]) -> NoReturn:
+                max_points: Optional[int] = 50000,
+                render_mode: str = 'auto',
+                show: bool = True,
+                reuse: bool = False,
+                **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a scatter plot.
 
@@ -715,9 +1577,35 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        max_points: int, default=50000
+            Maximum number of points to draw. If the data has more rows and
+            'x' and 'y' are numeric columns, the points are downsampled with
+            the Largest-Triangle-Three-Buckets algorithm. If None, all points
+            are drawn.
+
+        render_mode: {'auto', 'svg', 'webgl'}, default='auto'
+            Rendering backend of the traces. If 'auto', WebGL is used
+            for more than 5000 rows and SVG otherwise.
+
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.scatter' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
         if x is None and y is None:
             raise ValueError("Either 'x' or 'y' must be given")
 
@@ -726,12 +1614,17 @@ class ChartPainter:
             cols_or_lists.append(size)
         cols_or_lists = [el for el in cols_or_lists if el is not None]
         data = self._get_data(list(itertools.chain(*[[el] if isinstance(el, str) else el for el in cols_or_lists])))
-
-        if sort:
-            if n > 0:
-                data = data.sort_values(by=sort, ascending=False).head(n)
-            elif n < 0:
-                data = data.sort_values(by=sort, ascending=True).head(n)
+        data = _project(data, *cols_or_lists, *kwargs.values())
+        x_is_list, y_is_list = isinstance(x, list), isinstance(y, list)
+        dtx = data[x].dtype if isinstance(x, str) else None
+        dty = data[y].dtype if isinstance(y, str) else None
+
+        if sort and n:
+            data = _top_n(data, sort, n)
+        data = _maybe_downsample(data, x, y, max_points,
+                                 by=[color, symbol, *(subplots[:2] if subplots is not None else [])])
+        if render_mode == 'auto':
+            render_mode = 'webgl' if len(data) > _WEBGL_THRESHOLD else 'svg'
         if pd.api.types.is_number(size):
             marker_size = size
             size = None
@@ -744,9 +1637,7 @@ class ChartPainter:
         else:
             facet_row, facet_col, facet_col_wrap = None, None, None
         if color:
-            len_labels = data[color].nunique()
-            nums = np.linspace(0, len_labels, len_labels) / len_labels
-            color_discrete_sequence = [get_continuous_color(self._colorscale, z) for z in nums]
+            color_discrete_sequence = self._color_seq(self._nunique(data, color))
         else:
             color_discrete_sequence = None
         fig = px.scatter(data_frame=data,
@@ -759,39 +1650,40 @@ class ChartPainter:
                          facet_row=facet_row,
                          facet_col=facet_col,
                          facet_col_wrap=facet_col_wrap,
-                         color_discrete_sequence=color_discrete_sequence,
+                         color_discrete_sequence=color_discrete_sequence or self._pal,
                          opacity=opacity,
                          size_max=size_max,
                          orientation=orientation,
+                         render_mode=render_mode,
                          height=height,
                          width=width,
-                         **kwargs)
+                         **self._px_kwargs(kwargs, continuous=True))
         if edge:
             fig.update_traces(marker_line=dict(color='black', width=0.5))
         if marker_size:
             fig.update_traces(marker_size=marker_size)
         if text:
-            if pd.api.types.is_integer_dtype(data[text]):
+            if self._kind(data, text) in 'iu':
                 texttemplate = '%{text:d}'
-            elif pd.api.types.is_float_dtype(data[text]):
+            elif self._kind(data, text) == 'f':
                 texttemplate = f'%{{text:.{decimals}f}}'
             else:
                 texttemplate = '%{text}'
             fig.update_traces(texttemplate=texttemplate,
                               textposition='middle right')
         if title == 'auto':
-            if y and type(y) != list and pd.api.types.is_numeric_dtype(data[y]):
+            if y and not y_is_list and pd.api.types.is_numeric_dtype(dty):
                 title = f'Scatter Plot of {y}'
-            elif x and type(x) != list and pd.api.types.is_numeric_dtype(data[x]):
+            elif x and not x_is_list and pd.api.types.is_numeric_dtype(dtx):
                 title = f'Scatter Plot of {x}'
             else:
                 title = 'Scatter Plot'
-        if (y and type(y) != list and pd.api.types.is_numeric_dtype(data[y])) or (
-                y and type(y) == list and pd.api.types.is_numeric_dtype(data[y[0]])):
+        if (y and not y_is_list and pd.api.types.is_numeric_dtype(dty)) or (
+                y and y_is_list and self._kind(data, y[0]) in 'iufcb'):
             autorange = True
         else:
             autorange = 'reversed'
-        if type(x) == list or type(y) == list:
+        if x_is_list or y_is_list:
             legend = dict(orientation='h', x=0.5, xanchor='center', y=1.01, yanchor='bottom', title=None)
             margin = dict(l=5, r=5, t=80, b=5)
         else:
@@ -805,7 +1697,7 @@ class ChartPainter:
                           newshape_line_color=self._newshape_line_color)
         if slider:
             fig.update_xaxes(rangeslider_visible=True)
-        fig.show(config=self._config)
+        return self._show('scatter', fig, show, reuse)
 
     def line(self, x: Optional[Union[str, List[str]]] = None,
              y: Optional[Union[str, List[str]]] = None,
@@ -824,7 +1716,11 @@ class ChartPainter:
              height: Optional[int] = None,
              width: Optional[int] = None,
              font_size: int = 12,
-             **kwargs: Optional[Any]) -> NoReturn:
+             max_points: Optional[int] = 50000,
+             render_mode: str = 'auto',
+             show: bool = True,
+             reuse: bool = False,
+             **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a line plot.
 
@@ -894,21 +1790,51 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        max_points: int, default=50000
+            Maximum number of points to draw. If the data has more rows and
+            'x' and 'y' are numeric columns, each line is downsampled with
+            the Largest-Triangle-Three-Buckets algorithm. If None, all points
+            are drawn.
+
+        render_mode: {'auto', 'svg', 'webgl'}, default='auto'
+            Rendering backend of the traces. If 'auto', WebGL is used
+            for more than 5000 rows and SVG otherwise.
+
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.line' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
         if x is None and y is None:
             raise ValueError("Either 'x' or 'y' must be given")
 
         cols_or_lists = [x, y, sort, color, list(subplots[:2]) if subplots is not None else [], group, dash, text]
         cols_or_lists = [el for el in cols_or_lists if el is not None]
         data = self._get_data(list(itertools.chain(*[[el] if isinstance(el, str) else el for el in cols_or_lists])))
-
-        if sort:
-            if n > 0:
-                data = data.sort_values(by=sort, ascending=False).head(n)
-            elif n < 0:
-                data = data.sort_values(by=sort, ascending=True).head(n)
+        data = _project(data, *cols_or_lists, *kwargs.values())
+        x_is_list, y_is_list = isinstance(x, list), isinstance(y, list)
+
+        if sort and n:
+            data = _top_n(data, sort, n)
+        data = _maybe_downsample(data, x, y, max_points,
+                                 by=[color, group, dash, *(subplots[:2] if subplots is not None else [])])
+        data = self._as_categorical(data, color)
+        if render_mode == 'auto':
+            render_mode = 'webgl' if len(data) > _WEBGL_THRESHOLD else 'svg'
         if orientation == 'auto':
             orientation = None
         if subplots:
@@ -916,11 +1842,9 @@ class ChartPainter:
         else:
             facet_row, facet_col, facet_col_wrap = None, None, None
         if color:
-            len_labels = data[color].nunique()
-            nums = np.linspace(0, len_labels, len_labels) / len_labels
-            color_discrete_sequence = [get_continuous_color(self._colorscale, z) for z in nums]
+            color_discrete_sequence = self._discrete_seq(self._nunique(data, color))
         else:
-            color_discrete_sequence = None
+            color_discrete_sequence = self._pal
         fig = px.line(data_frame=data,
                       x=x,
                       y=y,
@@ -933,32 +1857,33 @@ class ChartPainter:
                       facet_col_wrap=facet_col_wrap,
                       color_discrete_sequence=color_discrete_sequence,
                       orientation=orientation,
+                      render_mode=render_mode,
                       height=height,
                       width=width,
-                      **kwargs)
-        fig.update_traces(line_width=line_width)
+                      **self._px_kwargs(kwargs))
+        trace_update = dict(line_width=line_width)
         if text:
-            if pd.api.types.is_integer_dtype(data[text]):
+            if self._kind(data, text) in 'iu':
                 texttemplate = '%{text:d}'
-            elif pd.api.types.is_float_dtype(data[text]):
+            elif self._kind(data, text) == 'f':
                 texttemplate = f'%{{text:.{decimals}f}}'
             else:
                 texttemplate = '%{text}'
-            fig.update_traces(texttemplate=texttemplate,
-                              textposition='top right')
+            trace_update.update(texttemplate=texttemplate, textposition='top right')
+        fig.update_traces(**trace_update)
         if title == 'auto':
-            if y and type(y) != list and pd.api.types.is_numeric_dtype(data[y]):
+            if y and not y_is_list and self._kind(data, y) in 'iufcb':
                 title = f'Line Plot of {y}'
-            elif x and type(x) != list and pd.api.types.is_numeric_dtype(data[x]):
+            elif x and not x_is_list and self._kind(data, x) in 'iufcb':
                 title = f'Line Plot of {x}'
             else:
                 title = 'Line Plot'
-        if (y and type(y) != list and pd.api.types.is_numeric_dtype(data[y])) or (
-                y and type(y) == list and pd.api.types.is_numeric_dtype(data[y[0]])):
+        if (y and not y_is_list and self._kind(data, y) in 'iufcb') or (
+                y and y_is_list and self._kind(data, y[0]) in 'iufcb'):
             autorange = True
         else:
             autorange = 'reversed'
-        if type(x) == list or type(y) == list:
+        if x_is_list or y_is_list:
             legend = dict(orientation='h', x=0.5, xanchor='center', y=1.01, yanchor='bottom', title=None)
             margin = dict(l=5, r=5, t=80, b=5)
         else:
@@ -972,7 +1897,7 @@ class ChartPainter:
                           newshape_line_color=self._newshape_line_color)
         if slider:
             fig.update_xaxes(rangeslider_visible=True)
-        fig.show(config=self._config)
+        return self._show('line', fig, show, reuse)
 
     def pie(self, labels: str,
             values: Optional[str] = None,
@@ -988,7 +1913,9 @@ class ChartPainter:
             height: Optional[int] = None,
             width: Optional[int] = None,
             font_size: int = 12,
-            **kwargs: Optional[Any]) -> NoReturn:
+            show: bool = True,
+            reuse: bool = False,
+            **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a pie chart.
 
@@ -1048,53 +1975,46 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.pie' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
         cols_or_lists = [labels, values, color]
         cols_or_lists = [el for el in cols_or_lists if el is not None]
         data = self._get_data(list(itertools.chain(*[[el] if isinstance(el, str) else el for el in cols_or_lists])))
+        data = self._as_categorical(data, labels)
 
         labels_input = labels
         values_input = values
         if not values:
-            data = data[labels].value_counts()
-            data_copy = data.copy()
-            if n and n > 0:
-                data = data.head(n)
-                if remainder:
-                    if data_copy[n:].sum() > 0:
-                        data['Other'] = data_copy[n:].sum()
-            elif n and n < 0:
-                data = data.tail(-n)
-                if remainder:
-                    if data_copy[:-n].sum() > 0:
-                        data['Other'] = data_copy[:-n].sum()
-            data = pd.DataFrame(data).reset_index()
-            values = labels
-            labels = 'index'
+            counts = data.groupby(labels, **_VC_KWARGS).size()
+            keys, counts = counts.index.to_numpy(dtype=object), counts.to_numpy()
+            values = 'count'
+            data = _pie_frame(labels, values, keys, counts, _top_k(counts, n), remainder)
             if text == 'percent':
-                hovertemplate = values + '=%{label}<br>count=%{value}'
+                hovertemplate = labels + '=%{label}<br>count=%{value}'
             else:  # text == 'value'
-                hovertemplate = values + '=%{label}<br>percent=%{percent}'
+                hovertemplate = labels + '=%{label}<br>percent=%{percent}'
         else:
             if n:
-                data = data.sort_values(by=values, ascending=False).set_index(labels)[values]
-                data_copy = data.copy()
-                if n > 0:
-                    data = data.head(n)
-                    if remainder:
-                        if data_copy[n:].sum() > 0:
-                            data['Other'] = data_copy[n:].sum()
-                elif n < 0:
-                    data = data.tail(-n)
-                    if remainder:
-                        if data_copy[:-n].sum() > 0:
-                            data['Other'] = data_copy[:-n].sum()
-            data = pd.DataFrame(data).reset_index()
-        len_labels = data[labels].nunique()
-        nums = np.linspace(0, len_labels, len_labels) / len_labels
-        color_discrete_sequence = [get_continuous_color(self._colorscale, z) for z in nums]
+                keys, vals = data[labels].to_numpy(dtype=object), data[values].to_numpy()
+                data = _pie_frame(labels, values, keys, vals, _top_k(vals, n), remainder)
+        color_discrete_sequence = self._discrete_seq(self._nunique(data, labels))
         fig = px.pie(data_frame=data,
                      names=labels,
                      values=values,
@@ -1104,14 +2024,13 @@ class ChartPainter:
                      hole=hole,
                      height=height,
                      width=width,
-                     **kwargs)
-        fig.update_traces(sort=False,
-                          textinfo=text,
-                          insidetextorientation=text_orientation)
+                     **self._px_kwargs(kwargs))
+        trace_update = dict(sort=False, textinfo=text, insidetextorientation=text_orientation)
         if edge:
-            fig.update_traces(marker_line=dict(color='white', width=1))
+            trace_update.update(marker_line=dict(color='white', width=1))
         if not values_input:
-            fig.update_traces(hovertemplate=hovertemplate)
+            trace_update.update(hovertemplate=hovertemplate)
+        fig.update_traces(**trace_update)
         if title == 'auto':
             title = f'Pie Chart of {labels_input}'
         fig.update_layout(title=dict(text=title, x=0.5, xref='paper'),
@@ -1119,7 +2038,7 @@ class ChartPainter:
                           margin=dict(l=5, r=5, t=50, b=5),
                           font_size=font_size,
                           newshape_line_color=self._newshape_line_color)
-        fig.show(config=self._config)
+        return self._show('pie', fig, show, reuse)
 
     def sunburst(self, path: List[str],
                  values: Optional[str] = None,
@@ -1130,7 +2049,9 @@ class ChartPainter:
                  height: Optional[int] = None,
                  width: Optional[int] = None,
                  font_size: int = 12,
-                 **kwargs: Optional[Any]) -> NoReturn:
+                 show: bool = True,
+                 reuse: bool = False,
+                 **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a sunburst plot.
 
@@ -1173,16 +2094,31 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.sunburst' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
         cols_or_lists = [path, values, color]
         cols_or_lists = [el for el in cols_or_lists if el is not None]
         data = self._get_data(list(itertools.chain(*[[el] if isinstance(el, str) else el for el in cols_or_lists])))
+        data = self._as_categorical(data, *path)
 
-        len_labels = data[path[0]].nunique()
-        nums = np.linspace(0, len_labels, len_labels) / len_labels
-        color_discrete_sequence = [get_continuous_color(self._colorscale, z) for z in nums]
+        color_discrete_sequence = self._discrete_seq(self._nunique(data, path[0]))
         fig = px.sunburst(data_frame=data,
                           path=path,
                           values=values,
@@ -1191,7 +2127,7 @@ class ChartPainter:
                           maxdepth=maxdepth,
                           height=height,
                           width=width,
-                          **kwargs)
+                          **self._px_kwargs(kwargs, continuous=True))
         fig.update_traces(insidetextorientation=text_orientation)
         if title == 'auto':
             title = f'Sunburst Plot of {path[0]}'
@@ -1199,7 +2135,7 @@ class ChartPainter:
                           margin=dict(l=5, r=5, t=50, b=5),
                           font_size=font_size,
                           newshape_line_color=self._newshape_line_color)
-        fig.show(config=self._config)
+        return self._show('sunburst', fig, show, reuse)
 
     def heatmap(self, labels: Optional[Tuple[str, str, str]] = None,
                 text: bool = False,
@@ -1209,7 +2145,9 @@ class ChartPainter:
                 height: Optional[int] = None,
                 width: Optional[int] = None,
                 font_size: int = 12,
-                **kwargs: Optional[Any]) -> NoReturn:
+                show: bool = True,
+                reuse: bool = False,
+                **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a heatmap.
 
@@ -1240,10 +2178,26 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.figure_factory.create_annotated_heatmap' for other
             possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        import plotly.figure_factory as ff
         if not isinstance(self._data, pd.DataFrame):
             raise TypeError('Input data must be given as a pandas.DataFrame')
         data = self._data
@@ -1281,8 +2235,9 @@ class ChartPainter:
                           height=height,
                           width=width,
                           font_size=font_size,
+                          template=self._template,
                           newshape_line_color=self._newshape_line_color)
-        fig.show(config=self._config)
+        return self._show('heatmap', fig, show, reuse)
 
     def density_heatmap(self, x: Optional[Union[str, List[str]]] = None,
                         y: Optional[Union[str, List[str]]] = None,
@@ -1295,7 +2250,9 @@ class ChartPainter:
                         height: Optional[int] = None,
                         width: Optional[int] = None,
                         font_size: int = 12,
-                        **kwargs: Optional[Any]) -> NoReturn:
+                        show: bool = True,
+                        reuse: bool = False,
+                        **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a density heatmap.
 
@@ -1345,9 +2302,25 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.density_heatmap' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
         if x is None and y is None:
             raise ValueError("Either 'x' or 'y' must be given")
 
@@ -1378,7 +2351,7 @@ class ChartPainter:
                                  histfunc=agg,
                                  height=height,
                                  width=width,
-                                 **kwargs)
+                                 **self._px_kwargs(kwargs, continuous=True))
         if title == 'auto':
             if x and y:
                 title = f'Density Heatmap of {x} and {y}'
@@ -1392,7 +2365,7 @@ class ChartPainter:
                           margin=dict(l=5, r=5, t=50, b=5),
                           font_size=font_size,
                           newshape_line_color=self._newshape_line_color)
-        fig.show(config=self._config)
+        return self._show('density_heatmap', fig, show, reuse)
 
     def gantt(self, x_start: str,
               x_end: str,
@@ -1406,7 +2379,9 @@ class ChartPainter:
               height: Optional[int] = None,
               width: Optional[int] = None,
               font_size: int = 12,
-              **kwargs: Optional[Any]) -> NoReturn:
+              show: bool = True,
+              reuse: bool = False,
+              **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a Gantt chart.
 
@@ -1453,23 +2428,38 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.express.timeline' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
         cols_or_lists = [x_start, x_end, y, color, list(subplots[:2]) if subplots is not None else []]
         cols_or_lists = [el for el in cols_or_lists if el is not None]
         data = self._get_data(list(itertools.chain(*[[el] if isinstance(el, str) else el for el in cols_or_lists])))
+        data = self._as_categorical(data, y, color)
 
         if subplots:
             facet_row, facet_col, facet_col_wrap = subplots[0], subplots[1], subplots[2]
         else:
             facet_row, facet_col, facet_col_wrap = None, None, None
         if color:
-            len_labels = data[color].nunique()
-            nums = np.linspace(0, len_labels, len_labels) / len_labels
-            color_discrete_sequence = [get_continuous_color(self._colorscale, z) for z in nums]
+            color_discrete_sequence = self._discrete_seq(self._nunique(data, color))
         else:
-            color_discrete_sequence = None
+            color_discrete_sequence = self._pal
         fig = px.timeline(data_frame=data,
                           x_start=x_start,
                           x_end=x_end,
@@ -1483,11 +2473,11 @@ class ChartPainter:
                           opacity=opacity,
                           height=height,
                           width=width,
-                          **kwargs)
+                          **self._px_kwargs(kwargs, continuous=True))
         if text:
-            if pd.api.types.is_integer_dtype(data[text]):
+            if self._kind(data, text) in 'iu':
                 texttemplate = '%{text:d}'
-            elif pd.api.types.is_float_dtype(data[text]):
+            elif self._kind(data, text) == 'f':
                 texttemplate = f'%{{text:.{decimals}f}}'
             else:
                 texttemplate = '%{text}'
@@ -1500,7 +2490,7 @@ class ChartPainter:
                           yaxis_autorange='reversed',
                           font_size=font_size,
                           newshape_line_color=self._newshape_line_color)
-        fig.show(config=self._config)
+        return self._show('gantt', fig, show, reuse)
 
     def pareto(self, x: str,
                bins: Union[List[int], str] = 'auto',
@@ -1511,7 +2501,9 @@ class ChartPainter:
                title: str = 'auto',
                height: Optional[int] = None,
                width: Optional[int] = None,
-               font_size: int = 12) -> NoReturn:
+               font_size: int = 12,
+               show: bool = True,
+               reuse: bool = False) -> 'go.Figure':
         """
         Makes a Pareto chart.
 
@@ -1547,47 +2539,74 @@ class ChartPainter:
 
         font_size: int, default=12
             Size of the global font.
+
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
+        go = _get_go()
         _data = self._get_data(x)
 
-        if pd.api.types.is_numeric_dtype(_data[x]):
+        if pd.api.types.is_integer_dtype(_data[x]) and bins == 'auto':
+            # every integer value gets its own bar
+            x_values = _data[x].dropna().to_numpy(dtype=np.int64)
+            x_values = x_values[x_values >= 0]
+            bins = np.arange(x_values.max() + 1 if len(x_values) else 0, dtype=np.int64)
+            values = np.bincount(x_values, minlength=len(bins))
+            labels = bins
+        elif pd.api.types.is_numeric_dtype(_data[x]):
             if bins == 'auto':
-                bins = np.arange(_data[x].max() + 1)
-            data = pd.cut(x=_data[x], bins=bins, right=False).value_counts().sort_index()
+                bins = np.arange(int(np.ceil(_data[x].max())) + 1, dtype=np.int64)
+            x_values = _data[x].dropna().to_numpy(dtype=np.float64)
+            values, _ = np.histogram(x_values, bins=bins)
+            # the bins are [a, b), np.histogram includes b in the last one
+            if len(values):
+                values[-1] -= np.count_nonzero(x_values == bins[-1])
             labels = bins  # [str(i) for i in data.index]
         else:
-            data = _data[x].value_counts()
+            data = _data.groupby(x, **_VC_KWARGS).size().sort_values(ascending=False)
+            values = data.values
             labels = data.index
-        values = data.values
-        shares = np.cumsum(data / data.sum()).values * 100
-        nums = np.linspace(0, len(labels), len(labels)) / len(labels)
-        cols = [get_continuous_color(self._colorscale, z) for z in nums]
+        shares = np.cumsum(values, dtype=np.float64)
+        shares *= 100.0 / shares[-1] if len(shares) else 1.0
+        cols = self._color_array(len(labels))
         if edge:
             line = dict(color='black', width=0.6)
         else:
             line = {}
-        fig = go.Figure()
-        fig.add_trace(go.Bar(x=labels,
-                             y=values,
-                             marker=dict(color=cols, line=line),
-                             opacity=opacity,
-                             name='Frequency',
-                             text=values))
-        fig.add_trace(go.Scatter(x=labels,
-                                 y=shares,
-                                 yaxis='y2',
-                                 name='Cumulative Percentage',
-                                 mode='lines',
-                                 marker_color=px.colors.qualitative.Plotly[0],
-                                 line_width=3))
         if text:
-            fig.update_traces(texttemplate='%{text:d}',
-                              textposition='outside',
-                              selector=dict(type='bar'))
-        fig.update_traces(hovertemplate='%{y}',
-                          selector=dict(type='bar'))
-        fig.update_traces(hovertemplate=f'%{{y:.{decimals}f}}%',
-                          selector=dict(type='scatter'))
+            bar_text = dict(text=values, texttemplate='%{text:d}', textposition='outside')
+        else:
+            bar_text = {}
+        scatter = go.Scattergl if len(shares) > _WEBGL_THRESHOLD else go.Scatter
+        fig = go.Figure(data=[go.Bar(x=labels,
+                                     y=values,
+                                     marker=dict(color=cols, line=line),
+                                     opacity=opacity,
+                                     name='Frequency',
+                                     hovertemplate='%{y}',
+                                     **bar_text),
+                              scatter(x=labels,
+                                      y=shares,
+                                      yaxis='y2',
+                                      name='Cumulative Percentage',
+                                      mode='lines',
+                                      marker_color=px.colors.qualitative.Plotly[0],
+                                      line_width=3,
+                                      hovertemplate=f'%{{y:.{decimals}f}}%')],
+                        layout=dict(template=self._template))
         if title == 'auto':
             title = f'Pareto Chart of {x}'
         fig.update_layout(title=dict(text=title, x=0.5, xref='paper'),
@@ -1607,7 +2626,7 @@ class ChartPainter:
                                       tickfont_color=px.colors.qualitative.Plotly[0]),
                           font_size=font_size,
                           newshape_line_color=self._newshape_line_color)
-        fig.show(config=self._config)
+        return self._show('pareto', fig, show, reuse)
 
     def sankey(self, n: int = 10,
                sort_labels: bool = False,
@@ -1618,7 +2637,9 @@ class ChartPainter:
                height: Optional[int] = None,
                width: Optional[int] = None,
                font_size: int = 10,
-               **kwargs: Optional[Any]) -> NoReturn:
+               show: bool = True,
+               reuse: bool = False,
+               **kwargs: Optional[Any]) -> 'go.Figure':
         """
         Makes a Sankey diagram.
 
@@ -1652,9 +2673,26 @@ class ChartPainter:
         font_size: int, default=12
             Size of the global font.
 
+        show: bool, default=True
+            Whether to display the figure.
+
+        reuse: bool, default=False
+            Whether to draw the figure in a FigureWidget that the next calls of this method
+            with reuse=True update in place instead of displaying a new one (when they
+            make the same traces). Requires ipywidgets in a notebook, otherwise
+            the figure is shown as usual.
+
         **kwargs: optional
             See 'plotly.graph_objects.Sankey' for other possible arguments.
+
+        Returns
+        -------
+        fig: plotly.graph_objects.Figure
+            The figure. It can be updated in place (e.g. using fig.update_traces
+            within fig.batch_update()) instead of calling the method again.
         """
+        px = _get_px()
+        go = _get_go()
         if not isinstance(self._dh, DataHolder):
             raise TypeError('Input data must be given as a sberpm.DataHolder')
 
@@ -1682,7 +2720,7 @@ class ChartPainter:
             link_color = t['source'].apply(lambda x: node_color[x % len(node_color)])
             link_color = link_color.apply(lambda x: f'rgba{x[3:-1]}, {opacity})')
 
-        fig = go.Figure()
+        fig = go.Figure(layout=dict(template=self._template))
         fig.add_trace(go.Sankey(node=dict(pad=10,
                                           thickness=10,
                                           line=dict(color='black', width=0.5),
@@ -1703,7 +2741,7 @@ class ChartPainter:
                           width=width,
                           font_size=font_size,
                           newshape_line_color=self._newshape_line_color)
-        fig.show(config=self._config)
+        return self._show('sankey', fig, show, reuse)
 
     def _get_data(self, metric_names: Union[str, List[str]]) -> pd.DataFrame:
         """
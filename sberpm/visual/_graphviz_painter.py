@@ -10,6 +10,8 @@
 #   Licence: BSD 3-Clause License
 #   Link: https://github.com/ipython/ipython/blob/master/LICENSE
 
+import re
+
 from graphviz import Digraph
 from IPython.display import HTML
 
@@ -17,6 +19,37 @@ from ._types import NodeType
 from ..miners._inductive_miner import ProcessTreeNode, ProcessTreeNodeType
 import numpy as np
 
+# Labels of the operator nodes of a process tree
+_PT_LABEL_DICT = {
+    ProcessTreeNodeType.EXCLUSIVE_CHOICE: 'X',
+    ProcessTreeNodeType.SEQUENTIAL: '->',
+    ProcessTreeNodeType.PARALLEL: '||',
+    ProcessTreeNodeType.LOOP: '*',
+    ProcessTreeNodeType.FLOWER: '?',
+}
+
+# Shapes and colours of the non-task nodes in apply_insights, other types get ('box', 'white')
+_INSIGHT_STYLE = {
+    NodeType.START_EVENT: ('circle', 'green'),
+    NodeType.END_EVENT: ('circle', 'red'),
+}
+
+# Hexadecimal representation of the gray colors: _HEX_COLOR[i] has all the RGB components equal to i
+_HEX_COLOR = [f'#{c:02X}{c:02X}{c:02X}' for c in range(256)]
+
+# Symbols graphviz can fail on while parsing the .gv-file, they are replaced with spaces
+_BAD_SYMBOLS = str.maketrans({':': ' ', '\\': ' '})
+
+# Default value of dict.get() that tells a missing key apart from any stored value
+_MISS = object()
+
+# Double quotes are escaped inside the quoted DOT strings
+# (quotes already escaped with a backslash are left as they are, like graphviz does)
+_UNESCAPED_QUOTE = re.compile(r'(?<!\\)((?:\\\\)*)"')
+
+# HTML-like labels ('<...>') are written without quotes
+_HTML_STRING = re.compile(r'<.*>$', re.DOTALL)
+
 
 class GvNode:
     """
@@ -62,14 +95,108 @@ def remove_bad_symbols(string):
     result: str
         String without bad symbols.
     """
-    bad_symbols = [':', '\\']
-    res = string
-    for s in bad_symbols:
-        res = res.replace(s, ' ')
-    return res
+    return string.translate(_BAD_SYMBOLS)
 
 
-def _get_gv_node(node, node_color_dict):
+def _quote(string):
+    """
+    Returns a string as a quoted DOT identifier. HTML-like strings ('<...>')
+    are returned unchanged.
+
+    Parameters
+    ----------
+    string: str
+        Id of a node, label or value of an attribute.
+
+    Returns
+    -------
+    result: str
+        String in double quotes.
+    """
+    if _HTML_STRING.match(string):
+        return string
+    if '"' in string:
+        string = _UNESCAPED_QUOTE.sub(r'\1\\"', string)
+    return f'"{string}"'
+
+
+def _dot_attrs(attrs):
+    """
+    Returns the DOT attribute list of a node or an edge.
+
+    Parameters
+    ----------
+    attrs: dict of {str: str}
+        Attributes, the ones with None values are skipped.
+
+    Returns
+    -------
+    result: str
+        Attribute list (with a leading space) or an empty string.
+    """
+    attr_list = ' '.join(f'{name}={_quote(value)}' for name, value in attrs.items() if value is not None)
+    return f' [{attr_list}]' if attr_list else ''
+
+
+def _dot_node(node_id, **attrs):
+    """
+    Returns the DOT statement of a node, it is added to the body of a Digraph.
+
+    Parameters
+    ----------
+    node_id: str
+        Id of the node.
+    attrs: str
+        Attributes of the node.
+
+    Returns
+    -------
+    line: str
+    """
+    return f'\t{_quote(node_id)}{_dot_attrs(attrs)}\n'
+
+
+def _dot_edge(source_id, target_id, **attrs):
+    """
+    Returns the DOT statement of an edge, it is added to the body of a Digraph.
+
+    Parameters
+    ----------
+    source_id: str
+        Id of the source node.
+    target_id: str
+        Id of the target node.
+    attrs: str
+        Attributes of the edge.
+
+    Returns
+    -------
+    line: str
+    """
+    return f'\t{_quote(source_id)} -> {_quote(target_id)}{_dot_attrs(attrs)}\n'
+
+
+def _connected_node_ids(edges):
+    """
+    Returns the ids of the nodes that have at least one input or output edge.
+
+    Parameters
+    ----------
+    edges : list of Edge
+        Edges of a graph.
+
+    Returns
+    -------
+    node_ids: set of str
+    """
+    node_ids = set()
+    for edge in edges:
+        node_ids.add(edge.source_node.id)
+        node_ids.add(edge.target_node.id)
+    return node_ids
+
+
+def _get_gv_node(node, node_id, node_color_dict):
     """
     Chooses visualisation parameters for a node.
 
@@ -77,13 +204,16 @@ def _get_gv_node(node, node_color_dict):
     ----------
     node : Node
         Node object.
+    node_id : str
+        Id of the node without bad symbols.
+    node_color_dict : dict of {str: str}
+        Colours of the nodes according to a metric.
 
     Returns
     -------
     gv_node: GvNode
         Object that contains a node's visualization parameters.
     """
-    node_id = remove_bad_symbols(node.id)
     node_label = remove_bad_symbols(node.label)
     if node.type == NodeType.TASK:
         node_label_with_metrics = GraphvizPainter._add_metrics_to_node_label(node_label, node.metrics)
@@ -172,57 +302,54 @@ class GraphvizPainter:
             self._apply_process_tree(graph)
             return
 
-        self._digraph = Digraph()
-
-        node_color_dict = GraphvizPainter._calc_nodes_colors_by_metric(graph, node_style_metric)
-        edge_width_dict = GraphvizPainter._calc_edges_widths_by_metric(graph, edge_style_metric)
-
-        for node in graph.get_nodes():
-            if not (hide_disconnected_nodes and len(node.output_edges) == 0 and len(node.input_edges) == 0):
-                gv_node = _get_gv_node(node, node_color_dict)
-                self._add_node_in_digraph(gv_node)
+        # the lists are made once and shared by all the steps below
+        nodes = graph.get_nodes()
+        edges = graph.get_edges()
+        node_color_dict = GraphvizPainter._calc_nodes_colors_by_metric(graph, nodes, node_style_metric)
+        edge_width_dict = GraphvizPainter._calc_edges_widths_by_metric(graph, edges, edge_style_metric)
+
+        # The DOT statements are collected in a list and given to the Digraph at once
+        body = []
+        # every id is cleaned once, not for each edge it belongs to
+        clean_id = {node.id: remove_bad_symbols(node.id) for node in nodes}
+        connected = _connected_node_ids(edges) if hide_disconnected_nodes else None
+        for node in nodes:
+            if not hide_disconnected_nodes or node.id in connected:
+                gv_node = _get_gv_node(node, clean_id[node.id], node_color_dict)
+                body.append(_dot_node(gv_node.id, label=gv_node.label, fillcolor=gv_node.fillcolor,
+                                      shape=gv_node.shape, style=gv_node.style))
 
-        for edge in graph.get_edges():
-            self._digraph.edge(remove_bad_symbols(edge.source_node.id), remove_bad_symbols(edge.target_node.id),
-                               penwidth=str(edge_width_dict[edge.id]) if edge.id in edge_width_dict else None,
-                               label=str(
-                                   edge.metrics[edge_style_metric]) if edge_style_metric in edge.metrics else None)
+        for edge in edges:
+            penwidth = edge_width_dict.get(edge.id)
+            label = edge.metrics.get(edge_style_metric, _MISS)
+            body.append(_dot_edge(clean_id[edge.source_node.id], clean_id[edge.target_node.id],
+                                  label=None if label is _MISS else str(label),
+                                  penwidth=None if penwidth is None else str(penwidth)))
+        self._digraph = Digraph(body=body)
 
     def apply_insights(self, graph, edge_style_metric='insights', hide_disconnected_nodes=True):
-        self._digraph = Digraph()
-        edge_width_dict = GraphvizPainter._calc_edges_widths_by_metric(graph, edge_style_metric)
+        edges = graph.get_edges()
+        edge_width_dict = GraphvizPainter._calc_edges_widths_by_metric(graph, edges, edge_style_metric)
 
+        body = []
+        connected = _connected_node_ids(edges) if hide_disconnected_nodes else None
         for node in graph.get_nodes():
-            if hide_disconnected_nodes and len(node.output_edges) == 0 and len(node.input_edges) == 0 \
-                    and node.id not in ['legend_good', 'legend_bad']:
+            if hide_disconnected_nodes and node.id not in connected and node.id not in ['legend_good', 'legend_bad']:
                 continue
-            style = 'filled'
             if node.type == NodeType.TASK:
-                shape = 'box'
-                color = node.color
-            elif node.type == NodeType.START_EVENT:
-                color = 'green'
-                shape = 'circle'
-            elif node.type == NodeType.END_EVENT:
-                color = 'red'
-                shape = 'circle'
-            if color == 'black':
-                color = 'white'
-            self._digraph.node(node.id,
-                               shape=shape,
-                               style=style,
-                               fillcolor=color,
-                               label=node.label)
+                shape, color = 'box', 'white' if node.color == 'black' else node.color
+            else:
+                shape, color = _INSIGHT_STYLE.get(node.type, ('box', 'white'))
+            body.append(_dot_node(node.id, label=node.label, fillcolor=color, shape=shape, style='filled'))
 
-        for edge in graph.get_edges():
+        for edge in edges:
             penwidth = edge_width_dict.get(edge.id)
             if penwidth:
                 penwidth = str(penwidth)
 
-            self._digraph.edge(edge.source_node.id, edge.target_node.id,
-                               label=edge.label,
-                               color=edge.color,
-                               penwidth=penwidth)
+            body.append(_dot_edge(edge.source_node.id, edge.target_node.id,
+                                  label=edge.label, color=edge.color, penwidth=penwidth))
+        self._digraph = Digraph(body=body)
 
     def _apply_process_tree(self, root_node):
         """
@@ -232,71 +359,55 @@ class GraphvizPainter:
         ----------
         root_node: ProcessTreeNode
         """
-        digraph = Digraph()
-
-        # Add nodes
-        label_dict = {
-            ProcessTreeNodeType.EXCLUSIVE_CHOICE: 'X',
-            ProcessTreeNodeType.SEQUENTIAL: '->',
-            ProcessTreeNodeType.PARALLEL: '||',
-            ProcessTreeNodeType.LOOP: '*',
-            ProcessTreeNodeType.FLOWER: '?',
-        }
+        body = []
+
+        # Add nodes (node2gvnode is keyed by id() of the tree nodes, the tree keeps them alive)
         node2gvnode = dict()
-        GraphvizPainter._add_process_tree_nodes(digraph, root_node, label_dict, node2gvnode)
+        GraphvizPainter._add_process_tree_nodes(body, root_node, node2gvnode)
 
         # Add edges
-        GraphvizPainter._add_process_tree_edges(digraph, root_node, node2gvnode)
+        GraphvizPainter._add_process_tree_edges(body, root_node, node2gvnode)
 
-        self._digraph = digraph
+        self._digraph = Digraph(body=body)
 
     @staticmethod
-    def _add_process_tree_nodes(digraph: Digraph, node, label_dict, node2gvnode):
-
-        if node.type == ProcessTreeNodeType.SINGLE_ACTIVITY:
-            if node.label is not None:
-                node_id = node.label
-                label = node.label
-                shape = 'box'
-                color = 'white'
+    def _add_process_tree_nodes(body, root_node, node2gvnode):
+        # Nodes are visited in pre-order with an explicit stack (deep trees do not hit the recursion limit)
+        stack = [root_node]
+        idx = 0
+        while stack:
+            node = stack.pop()
+            if node.type == ProcessTreeNodeType.SINGLE_ACTIVITY:
+                if node.label is not None:
+                    node_id = node.label
+                    label = node.label
+                    shape = 'box'
+                    color = 'white'
+                else:
+                    node_id = f'{node.type}_{idx}'
+                    label = ''
+                    shape = 'box'
+                    color = 'black'
             else:
-                node_id = node.type + '_' + str(len(node2gvnode))
-                label = ''
-                shape = 'box'
-                color = 'black'
-        else:
-            node_id = node.type + '_' + str(len(node2gvnode))
-            label = label_dict[node.type]
-            shape = 'circle'
-            color = 'white'
-        node2gvnode[node] = node_id
-        digraph.node(node_id, label, shape=shape, fillcolor=color, style='filled')
-        for n in node.children:
-            GraphvizPainter._add_process_tree_nodes(digraph, n, label_dict, node2gvnode)
+                node_id = f'{node.type}_{idx}'
+                label = _PT_LABEL_DICT[node.type]
+                shape = 'circle'
+                color = 'white'
+            idx += 1
+            node2gvnode[id(node)] = node_id
+            body.append(_dot_node(node_id, label=label, fillcolor=color, shape=shape, style='filled'))
+            stack.extend(reversed(node.children))
 
     @staticmethod
-    def _add_process_tree_edges(digraph: Digraph, node, node2gvnode):
-        n1 = node2gvnode[node]
-        for node2 in node.children:
-            n2 = node2gvnode[node2]
-            digraph.edge(n1, n2)
-        for node2 in node.children:
-            GraphvizPainter._add_process_tree_edges(digraph, node2, node2gvnode)
-
-    def _add_node_in_digraph(self, gv_node):
-        """
-        Adds a GvNode to the graph.
-
-        Parameters
-        ----------
-        gv_node: GvNode
-            Represents a node object with graphviz's parameters.
-        """
-        self._digraph.node(gv_node.id,
-                           shape=gv_node.shape,
-                           fillcolor=gv_node.fillcolor,
-                           style=gv_node.style,
-                           label=gv_node.label)
+    def _add_process_tree_edges(body, root_node, node2gvnode):
+        stack = [root_node]
+        while stack:
+            node = stack.pop()
+            n1 = node2gvnode[id(node)]
+            for node2 in node.children:
+                n2 = node2gvnode[id(node2)]
+                body.append(_dot_edge(n1, n2))
+            stack.extend(reversed(node.children))
 
     def write_graph(self, filename, format, prog='dot'):
         """
@@ -346,12 +457,13 @@ class GraphvizPainter:
         label: str
             Modified node's label.
         """
-        for metric_name, metric_value in metrics.items():
-            label += '\\n' + metric_name + ': ' + str(round(metric_value, 3))
-        return label
+        parts = [label]
+        parts.extend(f'{metric_name}: {round(metric_value, 3)}' for metric_name, metric_value in metrics.items())
+        # '\\n' is a line break in a graphviz label
+        return '\\n'.join(parts)
 
     @staticmethod
-    def _calc_nodes_colors_by_metric(graph, node_style_metric):
+    def _calc_nodes_colors_by_metric(graph, nodes, node_style_metric):
         """
         Calculate nodes' colours according to given metric.
 
@@ -359,6 +471,8 @@ class GraphvizPainter:
         -------------
         graph: Graph
             Graph object.
+        nodes: list of Node
+            Nodes of the graph.
         node_style_metric
             Name of the metric.
 
@@ -374,34 +488,32 @@ class GraphvizPainter:
             print(f'WARNING: graph does not contain node metric "{node_style_metric}". '
                   f'Nodes will have the same colour.')
             return {}
-        nodes = graph.get_nodes()
-        metric_values = [node.metrics[node_style_metric] for node in nodes if node_style_metric in node.metrics]
-        if any(np.isnan(metric_values)):
+        metric_nodes, metric_values = [], []
+        for node in nodes:
+            metric_value = node.metrics.get(node_style_metric, _MISS)
+            if metric_value is not _MISS:
+                metric_nodes.append(node)
+                metric_values.append(metric_value)
+        metric_values = np.array(metric_values, dtype=np.float64)
+        if np.isnan(metric_values).any():
             print(f"WARNING: metric \"{node_style_metric}\" contains None values, "
                   f"impossible to use it for changing the nodes' style")
             return {}
 
-        node_color_dict = {}
-        min_value = min(metric_values)
-        max_value = max(metric_values)
+        min_value = metric_values.min()
+        max_value = metric_values.max()
         if min_value == max_value:
             return {}
         darkest_color = 100  # 0 is the darkest
         lightest_color = 250  # 255 is the lightest
 
-        for node in nodes:
-            if node_style_metric in node.metrics:
-                node_metric_value = node.metrics[node_style_metric]
-                node_color_int = int(
-                    lightest_color - (lightest_color - darkest_color) * (node_metric_value - min_value) / (
-                            max_value - min_value))
-                node_color_dict[node.id] = _get_hex_color(node_color_int)
-            else:
-                node_color_dict[node.id] = None
-        return node_color_dict
+        node_color_ints = (lightest_color - (lightest_color - darkest_color) * (metric_values - min_value) / (
+                max_value - min_value)).astype(np.int64)
+        return {node.id: _HEX_COLOR[node_color_int]
+                for node, node_color_int in zip(metric_nodes, node_color_ints.tolist())}
 
     @staticmethod
-    def _calc_edges_widths_by_metric(graph, edge_style_metric):
+    def _calc_edges_widths_by_metric(graph, edges, edge_style_metric):
         """
         Calculate edges' width according to given metric.
 
@@ -409,6 +521,8 @@ class GraphvizPainter:
         -------------
         graph: Graph
             Graph object.
+        edges: list of Edge
+            Edges of the graph.
         edge_style_metric
             Name of the metric.
 
@@ -424,71 +538,26 @@ class GraphvizPainter:
             print(f'WARNING: graph does not contain edge metric "{edge_style_metric}". '
                   f'Edges will have the same width.')
             return {}
-        metric_values = [edge.metrics[edge_style_metric] for edge in graph.get_edges() if
-                         edge_style_metric in edge.metrics]
-        if any(np.isnan(metric_values)):
+        metric_edges, metric_values = [], []
+        for edge in edges:
+            metric_value = edge.metrics.get(edge_style_metric, _MISS)
+            if metric_value is not _MISS:
+                metric_edges.append(edge)
+                metric_values.append(metric_value)
+        metric_values = np.array(metric_values, dtype=np.float64)
+        if np.isnan(metric_values).any():
             print(f"WARNING: metric \"{edge_style_metric}\" contains None values, "
                   f"impossible to use it for changing the edges' style")
             return {}
 
-        edge_width_dict = {}
-        min_value = min(metric_values)
-        max_value = max(metric_values)
+        min_value = metric_values.min()
+        max_value = metric_values.max()
         if min_value == max_value:
             return {}
         min_penwidth = 0.1
         max_penwidth = 5
 
-        for edge in graph.get_edges():
-            if edge_style_metric in edge.metrics:
-                edge_metric_value = edge.metrics[edge_style_metric]
-                score = (edge_metric_value - min_value) / (max_value - min_value)
-                edge_width_dict[edge.id] = min_penwidth + (max_penwidth - min_penwidth) * score
-        return edge_width_dict
-
-
-def _get_hex_color(int_color):
-    """
-    Transform color to hexadecimal representation.
-
-    Parameters
-    -------------
-    int_color: int
-        Number from 0 to 255.
-
-    Returns
-    -------------
-    hex_string: str
-        Hexadecimal color. Example: "#AA5500".
-    """
-    left_r = _get_hex_string(int(int_color) // 16)
-    right_r = _get_hex_string(int(int_color) % 16)
-
-    left_g = _get_hex_string(int(int_color) // 16)
-    right_g = _get_hex_string(int(int_color) % 16)
-
-    left_b = _get_hex_string(int(int_color) // 16)
-    right_b = _get_hex_string(int(int_color) % 16)
+        scores = (metric_values - min_value) / (max_value - min_value)
+        edge_widths = min_penwidth + (max_penwidth - min_penwidth) * scores
+        return dict(zip([edge.id for edge in metric_edges], edge_widths.tolist()))
 
-    res = "#" + left_r + right_r + left_g + right_g + left_b + right_b
-    return res
-
-
-def _get_hex_string(num):
-    """
-    Returns an hexadecimal string corresponding to a given number.
-
-    Parameters
-    -------------
-    num: int
-        Number, must be one of {0, 1, 2,..., 13, 14, 15}.
-
-    Returns
-    -------------
-    hex_string: str
-        Hexadecimal string.
-    """
-    if num < 10:
-        return str(num)
-    else:
-        return ['A', 'B', 'C', 'D', 'E', 'F'][num - 10]
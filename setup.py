@@ -1,5 +1,6 @@
 import setuptools
 import re
+from pathlib import Path
 
 version_file = "sberpm/_version.py"
 
@@ -15,7 +16,7 @@ def get_version(version_file):
 
 
 def parse_requirements(filename):
-    lineiter = (line.strip() for line in open(filename))
+    lineiter = (line.strip() for line in Path(filename).read_text().splitlines())
     return [line for line in lineiter if line and not line.startswith("#")]
 
 